@@ -1,169 +1,207 @@
-import json
-import os
-import requests
-from urllib.parse import urljoin
-from collections import defaultdict
-
-# 配置部分
-BASE_API_URL = "https://raw.githubusercontent.com/ByMykel/CSGO-API/main/public/api/zh-CN/"
-CACHE_DIR = "translation_cache"
-OUTPUT_DIR = "translated"
-os.makedirs(CACHE_DIR, exist_ok=True)
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-class AgentTranslator:
-    def __init__(self):
-        self.translations = {}
-        self.index = defaultdict(dict)
-    
-    def load_translations(self):
-        """加载探员翻译数据"""
-        cache_file = os.path.join(CACHE_DIR, "agents.json")
-        api_url = urljoin(BASE_API_URL, "agents.json")
-        
-        try:
-            # 尝试从缓存加载
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    self.translations = json.load(f)
-                print("✓ 从缓存加载探员翻译数据")
-                return True
-            
-            # 从API下载
-            print("正在下载探员翻译数据...")
-            response = requests.get(api_url, timeout=10)
-            response.raise_for_status()
-            self.translations = response.json()
-            
-            # 保存到缓存
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.translations, f, ensure_ascii=False, indent=2)
-            
-            print("✓ 探员翻译数据下载成功")
-            return True
-        except Exception as e:
-            print(f"✗ 加载探员翻译数据失败: {str(e)}")
-            return False
-    
-    def build_index(self):
-        """构建探员翻译索引"""
-        if not self.translations:
-            return False
-        
-        for agent in self.translations:
-            # 通过model_player路径匹配
-            if model := agent.get('model_player'):
-                # 标准化路径格式 (兼容不同斜杠方向)
-                normalized_model = model.replace('\\', '/').lower()
-                self.index['model'][normalized_model] = agent
-            
-            # 通过market_hash_name匹配
-            if market_name := agent.get('market_hash_name'):
-                self.index['market_name'][market_name.lower()] = agent
-            
-            # 通过名称匹配
-            if name := agent.get('name'):
-                self.index['name'][name.lower()] = agent
-        
-        print(f"✓ 已建立 {len(self.translations)} 条探员翻译索引")
-        return True
-    
-    def translate_item(self, item):
-        """翻译单个探员项目"""
-        # 检查是否已经是中文
-        if self._is_already_translated(item.get('agent_name', '')):
-            return item
-        
-        translation = None
-        
-        # 1. 通过model路径匹配
-        if 'model' in item:
-            # 标准化模型路径
-            normalized_model = item['model'].replace('\\', '/').lower()
-            translation = self.index['model'].get(normalized_model)
-        
-        # 2. 通过agent_name匹配
-        if not translation and 'agent_name' in item:
-            # 尝试完整匹配
-            translation = self.index['market_name'].get(item['agent_name'].lower())
-            # 尝试去除代号部分匹配 (如 "'Blueberries' Buckshot" → "Buckshot")
-            if not translation and "'" in item['agent_name']:
-                clean_name = item['agent_name'].split('|')[0].split("'")[-1].strip()
-                translation = self.index['market_name'].get(clean_name.lower())
-        
-        if translation:
-            # 应用翻译
-            item['agent_name'] = translation['name']
-            return item
-        
-        return item
-    
-    def _is_already_translated(self, text):
-        """检查文本是否已包含中文字符"""
-        if not text:
-            return False
-        return any('\u4e00' <= char <= '\u9fff' for char in text)
-    
-    def translate_file(self, input_file):
-        """翻译整个探员文件"""
-        try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, list):
-                print("错误: 输入文件格式不正确，应为探员数组")
-                return False
-            
-            total = len(data)
-            translated = 0
-            
-            for i, item in enumerate(data, 1):
-                original_name = item.get('agent_name', '')
-                result = self.translate_item(item)
-                
-                if result.get('agent_name', '') != original_name:
-                    translated += 1
-                
-                # 进度显示
-                if i % 10 == 0 or i == total:
-                    print(f"\r处理进度: {i}/{total} ({translated} 已翻译)", end='')
-            
-            # 保存结果
-            output_file = os.path.join(OUTPUT_DIR, os.path.basename(input_file))
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            
-            print(f"\n✓ 翻译完成! 结果已保存到 {output_file}")
-            print(f"统计: 共 {total} 条，{translated} 条已翻译")
-            return True
-        except Exception as e:
-            print(f"\n✗ 翻译文件时出错: {str(e)}")
-            return False
-
-def main():
-    print("=== CSGO探员专用翻译工具 ===")
-    print("正在初始化...\n")
-    
-    translator = AgentTranslator()
-    
-    # 1. 加载翻译数据
-    if not translator.load_translations():
-        print("无法继续，请检查网络连接或API可用性")
-        return
-    
-    # 2. 构建索引
-    if not translator.build_index():
-        print("无法构建翻译索引")
-        return
-    
-    # 3. 处理文件
-    input_file = "agents.json"
-    if not os.path.exists(input_file):
-        print(f"错误: 输入文件 {input_file} 不存在")
-        return
-    
-    print(f"\n开始翻译文件: {input_file}")
-    translator.translate_file(input_file)
-
-if __name__ == '__main__':
+import os
+from collections import defaultdict
+from catalog import LOCALE, entry_name, load_catalog
+from snapshot import restore_index, save_index
+from jsonio import JsonArrayWriter, NotJsonArrayError, read_json_array
+from batch import TranslationMemo, batched
+import fuzzy
+import stats
+
+# 配置部分
+OUTPUT_DIR = "translated"
+
+# 需要保存到索引快照的属性
+INDEX_ATTRS = ('index',)
+
+class AgentTranslator:
+    def __init__(self, locale=LOCALE):
+        self.locale = locale  # CSGO-API目录语言
+        self.translations = {}
+        self.restored = None  # 是否已从快照恢复索引 (None为还没有尝试)
+        self.index = defaultdict(dict)
+        self._memo = TranslationMemo(self.translate_item, self._lookup_key, 'agent_name', name="AgentTranslator")
+        self._fuzzy = fuzzy.FuzzyMatcher()
+    
+    def load_translations(self):
+        """加载探员翻译数据 (目录未变化时直接从快照恢复索引，不解析目录)"""
+        try:
+            self.restored = None
+            self.translations = load_catalog("agents.json", timeout=10, locale=self.locale,
+                                             restore=self._restore_index) or []
+            if not self.restored:
+                print("✓ 探员翻译数据加载成功")
+            return True
+        except Exception as e:
+            print(f"✗ 加载探员翻译数据失败: {str(e)}")
+            return False
+    
+    def build_index(self):
+        """构建探员翻译索引"""
+        self._memo.clear()
+        self._fuzzy.clear()
+        # 目录未变化时直接加载上次构建的索引 (通常已在load_translations中恢复)
+        if self.restored or (self.restored is None and self.translations and self._restore_index()):
+            self.translations = []
+            print("✓ 已从快照加载探员索引")
+            return True
+        if not self.translations:
+            return False
+        
+        for agent in self.translations:
+            # 索引只保存中文名称
+            zh_name = entry_name(agent)
+            
+            # 通过model_player路径匹配
+            if model := agent.get('model_player'):
+                # 标准化路径格式 (兼容不同斜杠方向)
+                normalized_model = model.replace('\\', '/').lower()
+                self.index['model'][normalized_model] = zh_name
+            
+            # 通过market_hash_name匹配
+            if market_name := agent.get('market_hash_name'):
+                self.index['market_name'][market_name.lower()] = zh_name
+            
+            # 通过名称匹配
+            if name := agent.get('name'):
+                self.index['name'][name.lower()] = zh_name
+        
+        save_index(self, "agents.json", INDEX_ATTRS)
+        print(f"✓ 已建立 {len(self.translations)} 条探员翻译索引")
+        # 索引已包含翻译需要的全部数据，释放原始目录
+        self.translations = []
+        return True
+    
+    def _restore_index(self):
+        self.restored = restore_index(self, "agents.json", INDEX_ATTRS)
+        return self.restored
+    
+    def translate_item(self, item):
+        """翻译单个探员项目"""
+        probe = stats.probe("AgentTranslator")
+        
+        # 检查是否已经是中文
+        if self._is_already_translated(item.get('agent_name', '')):
+            probe.hit("already_translated")
+            return item
+        probe.miss("already_translated")
+        
+        translation = None
+        
+        # 1. 通过model路径匹配
+        if 'model' in item:
+            # 标准化模型路径
+            normalized_model = item['model'].replace('\\', '/').lower()
+            translation = self.index['model'].get(normalized_model)
+            if translation is not None:
+                probe.hit("model")
+            else:
+                probe.miss("model")
+        
+        # 2. 通过agent_name匹配
+        if translation is None and 'agent_name' in item:
+            # 尝试完整匹配
+            translation = self.index['market_name'].get(item['agent_name'].lower())
+            if translation is not None:
+                probe.hit("market_name")
+            else:
+                probe.miss("market_name")
+            # 尝试去除代号部分匹配 (如 "'Blueberries' Buckshot" → "Buckshot")
+            if translation is None and "'" in item['agent_name']:
+                clean_name = item['agent_name'].split('|')[0].split("'")[-1].strip()
+                translation = self.index['market_name'].get(clean_name.lower())
+                if translation is not None:
+                    probe.hit("market_name_stripped")
+                else:
+                    probe.miss("market_name_stripped")
+            
+            # 3. 近似匹配 (默认关闭)
+            if translation is None and fuzzy.ENABLED:
+                translation = self._fuzzy.match(self.index, 'market_name', item['agent_name'].lower())
+                if translation is not None:
+                    probe.hit("fuzzy")
+                else:
+                    probe.miss("fuzzy")
+        
+        if translation is not None:
+            # 应用翻译
+            item['agent_name'] = translation
+            return item
+        
+        return item
+    
+    def _is_already_translated(self, text):
+        """检查文本是否已包含中文字符"""
+        if not text:
+            return False
+        return any('\u4e00' <= char <= '\u9fff' for char in text)
+    
+    def _lookup_key(self, item):
+        """translate_item读取的全部字段，相同的行翻译结果相同"""
+        return ('model' in item, item.get('model'), 'agent_name' in item, item.get('agent_name'))
+    
+    def translate_many(self, items):
+        """批量翻译探员项目，相同model和名称的行只解析一次"""
+        return self._memo.translate_many(items)
+    
+    def translate_file(self, input_file, stream=False):
+        """翻译整个探员文件，stream为True时逐条读写，内存占用与文件大小无关"""
+        try:
+            try:
+                data = read_json_array(input_file, stream)
+            except NotJsonArrayError:
+                print("错误: 输入文件格式不正确，应为探员数组")
+                return False
+            
+            total = len(data) if isinstance(data, list) else None
+            translated = 0
+            i = 0
+            
+            os.makedirs(OUTPUT_DIR, exist_ok=True)
+            output_file = os.path.join(OUTPUT_DIR, os.path.basename(input_file))
+            with JsonArrayWriter(output_file) as writer:
+                for chunk in batched(data):
+                    original_names = [item.get('agent_name', '') for item in chunk]
+                    for original_name, result in zip(original_names, self.translate_many(chunk)):
+                        i += 1
+                        if result.get('agent_name', '') != original_name:
+                            translated += 1
+                        writer.write(result)
+                        
+                        # 进度显示
+                        if i % 10 == 0 or i == total:
+                            print(f"\r处理进度: {i}/{total or '?'} ({translated} 已翻译)", end='')
+            
+            print(f"\n✓ 翻译完成! 结果已保存到 {output_file}")
+            print(f"统计: 共 {i} 条，{translated} 条已翻译")
+            return True
+        except Exception as e:
+            print(f"\n✗ 翻译文件时出错: {str(e)}")
+            return False
+
+def main():
+    print("=== CSGO探员专用翻译工具 ===")
+    print("正在初始化...\n")
+    
+    translator = AgentTranslator()
+    
+    # 1. 加载翻译数据
+    if not translator.load_translations():
+        print("无法继续，请检查网络连接或API可用性")
+        return
+    
+    # 2. 构建索引
+    if not translator.build_index():
+        print("无法构建翻译索引")
+        return
+    
+    # 3. 处理文件
+    input_file = "agents.json"
+    if not os.path.exists(input_file):
+        print(f"错误: 输入文件 {input_file} 不存在")
+        return
+    
+    print(f"\n开始翻译文件: {input_file}")
+    translator.translate_file(input_file)
+
+if __name__ == '__main__':
     main()
\ No newline at end of file
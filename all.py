@@ -1,390 +1,683 @@
-#!/usr/bin/env python3
-import os
-import sys
-import json
-import time
-from datetime import datetime
-
-# 导入所有翻译器模块
-try:
-    from agents import AgentTranslator
-    from keychains import KeychainTranslator
-    from music import MusicKitTranslator
-    from skins import SkinGloveTranslator
-    from stickers import StickerTranslator
-except ImportError as e:
-    print(f"错误: 无法导入翻译器模块 - {e}")
-    print("请确保所有翻译器文件(agents.py, keychains.py, music_kits.py, skins.py, stickers.py)位于同一目录。")
-    sys.exit(1)
-
-# 配置
-INPUT_DIR = "."  # 默认在当前目录寻找JSON文件
-OUTPUT_DIR = "translated"  # 输出文件目录
-LOG_DIR = "logs"  # 日志目录
-CACHE_DIR = "translation_cache"  # 翻译缓存目录
-
-# 确保目录存在
-for directory in [OUTPUT_DIR, LOG_DIR, CACHE_DIR]:
-    os.makedirs(directory, exist_ok=True)
-
-def get_log_file():
-    """生成日志文件名"""
-    return os.path.join(LOG_DIR, f"translation_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
-
-def log_message(message, log_file):
-    """记录日志到文件和控制台"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] {message}"
-    print(log_message)
-    
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(log_message + "\n")
-
-def save_translated_data(data, output_file):
-    """保存翻译后的数据到文件"""
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-def translate_agents(log_file):
-    """翻译探员数据"""
-    input_file = os.path.join(INPUT_DIR, "agents.json")
-    output_file = os.path.join(OUTPUT_DIR, "agents.json")
-    
-    if not os.path.exists(input_file):
-        log_message(f"错误: 找不到探员输入文件 {input_file}", log_file)
-        return False
-    
-    log_message("开始翻译探员数据...", log_file)
-    
-    # 初始化探员翻译器
-    translator = AgentTranslator()
-    if not translator.load_translations():
-        log_message("探员翻译器初始化失败", log_file)
-        return False
-    
-    translator.build_index()
-    
-    # 读取输入文件
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not isinstance(data, list):
-            log_message(f"错误: 探员文件格式不正确，应为JSON数组", log_file)
-            return False
-        
-        # 翻译
-        translated_count = 0
-        total_count = len(data)
-        
-        for i, item in enumerate(data):
-            original_name = item.get('agent_name', '')
-            translated_item = translator.translate_item(item)
-            
-            # 检查是否翻译成功
-            if translated_item.get('agent_name', '') != original_name:
-                translated_count += 1
-            
-            # 更新原始数据
-            data[i] = translated_item
-        
-        # 保存结果
-        save_translated_data(data, output_file)
-        
-        log_message(f"✓ 探员翻译完成: {translated_count}/{total_count} 项已翻译", log_file)
-        return True
-        
-    except Exception as e:
-        log_message(f"✗ 探员翻译失败: {str(e)}", log_file)
-        return False
-
-def translate_keychains(log_file):
-    """翻译钥匙扣数据"""
-    input_file = os.path.join(INPUT_DIR, "keychains.json")
-    output_file = os.path.join(OUTPUT_DIR, "keychains.json")
-    
-    if not os.path.exists(input_file):
-        log_message(f"错误: 找不到钥匙扣输入文件 {input_file}", log_file)
-        return False
-    
-    log_message("开始翻译钥匙扣数据...", log_file)
-    
-    # 初始化钥匙扣翻译器
-    translator = KeychainTranslator()
-    if not translator.load_translations():
-        log_message("钥匙扣翻译器初始化失败", log_file)
-        return False
-    
-    translator.build_index()
-    
-    # 读取输入文件
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not isinstance(data, list):
-            log_message(f"错误: 钥匙扣文件格式不正确，应为JSON数组", log_file)
-            return False
-        
-        # 翻译
-        translated_count = 0
-        total_count = len(data)
-        
-        for i, item in enumerate(data):
-            original_name = item.get('name', '')
-            translated_item = translator.translate_item(item)
-            
-            # 检查是否翻译成功
-            if translated_item.get('name', '') != original_name:
-                translated_count += 1
-            
-            # 更新原始数据
-            data[i] = translated_item
-        
-        # 保存结果
-        save_translated_data(data, output_file)
-        
-        log_message(f"✓ 钥匙扣翻译完成: {translated_count}/{total_count} 项已翻译", log_file)
-        return True
-        
-    except Exception as e:
-        log_message(f"✗ 钥匙扣翻译失败: {str(e)}", log_file)
-        return False
-
-def translate_music_kits(log_file):
-    """翻译音乐盒数据"""
-    input_file = os.path.join(INPUT_DIR, "music.json")
-    output_file = os.path.join(OUTPUT_DIR, "music.json")
-    
-    if not os.path.exists(input_file):
-        log_message(f"错误: 找不到音乐盒输入文件 {input_file}", log_file)
-        return False
-    
-    log_message("开始翻译音乐盒数据...", log_file)
-    
-    # 初始化音乐盒翻译器
-    translator = MusicKitTranslator()
-    if not translator.load_translations():
-        log_message("音乐盒翻译器初始化失败", log_file)
-        return False
-    
-    translator.build_index()
-    
-    # 读取输入文件
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not isinstance(data, list):
-            log_message(f"错误: 音乐盒文件格式不正确，应为JSON数组", log_file)
-            return False
-        
-        # 翻译
-        translated_count = 0
-        total_count = len(data)
-        
-        for i, item in enumerate(data):
-            original_name = item.get('name', '')
-            translated_item = translator.translate_item(item)
-            
-            # 检查是否翻译成功
-            if translated_item.get('name', '') != original_name:
-                translated_count += 1
-            
-            # 更新原始数据
-            data[i] = translated_item
-        
-        # 保存结果
-        save_translated_data(data, output_file)
-        
-        log_message(f"✓ 音乐盒翻译完成: {translated_count}/{total_count} 项已翻译", log_file)
-        return True
-        
-    except Exception as e:
-        log_message(f"✗ 音乐盒翻译失败: {str(e)}", log_file)
-        return False
-
-def translate_skins_gloves(log_file):
-    """翻译皮肤和手套数据"""
-    skin_input_file = os.path.join(INPUT_DIR, "skins.json")
-    skin_output_file = os.path.join(OUTPUT_DIR, "skins.json")
-    
-    glove_input_file = os.path.join(INPUT_DIR, "gloves.json")
-    glove_output_file = os.path.join(OUTPUT_DIR, "gloves.json")
-    
-    if not os.path.exists(skin_input_file) and not os.path.exists(glove_input_file):
-        log_message(f"错误: 找不到皮肤/手套输入文件", log_file)
-        return False
-    
-    log_message("开始翻译皮肤和手套数据...", log_file)
-    
-    # 初始化皮肤/手套翻译器
-    translator = SkinGloveTranslator()
-    if not translator.load_translations():
-        log_message("皮肤/手套翻译器初始化失败", log_file)
-        return False
-    
-    translator.build_index()
-    
-    # 处理皮肤文件
-    success = True
-    if os.path.exists(skin_input_file):
-        try:
-            log_message("处理皮肤数据...", log_file)
-            with open(skin_input_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, list):
-                log_message(f"错误: 皮肤文件格式不正确，应为JSON数组", log_file)
-                success = False
-            else:
-                # 翻译
-                translated_count = 0
-                total_count = len(data)
-                
-                for i, item in enumerate(data):
-                    original_name = item.get('paint_name', '')
-                    translated_item = translator.translate_item(item, is_glove=False)
-                    
-                    # 检查是否翻译成功
-                    if translated_item.get('paint_name', '') != original_name:
-                        translated_count += 1
-                    
-                    # 更新原始数据
-                    data[i] = translated_item
-                
-                # 保存结果
-                save_translated_data(data, skin_output_file)
-                
-                log_message(f"✓ 皮肤翻译完成: {translated_count}/{total_count} 项已翻译", log_file)
-        except Exception as e:
-            log_message(f"✗ 皮肤翻译失败: {str(e)}", log_file)
-            success = False
-    
-    # 处理手套文件
-    if os.path.exists(glove_input_file):
-        try:
-            log_message("处理手套数据...", log_file)
-            with open(glove_input_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, list):
-                log_message(f"错误: 手套文件格式不正确，应为JSON数组", log_file)
-                success = False
-            else:
-                # 翻译
-                translated_count = 0
-                total_count = len(data)
-                
-                for i, item in enumerate(data):
-                    original_name = item.get('paint_name', '')
-                    translated_item = translator.translate_item(item, is_glove=True)
-                    
-                    # 检查是否翻译成功
-                    if translated_item.get('paint_name', '') != original_name:
-                        translated_count += 1
-                    
-                    # 更新原始数据
-                    data[i] = translated_item
-                
-                # 保存结果
-                save_translated_data(data, glove_output_file)
-                
-                log_message(f"✓ 手套翻译完成: {translated_count}/{total_count} 项已翻译", log_file)
-        except Exception as e:
-            log_message(f"✗ 手套翻译失败: {str(e)}", log_file)
-            success = False
-    
-    return success
-
-def translate_stickers(log_file):
-    """翻译印花数据"""
-    input_file = os.path.join(INPUT_DIR, "stickers.json")
-    output_file = os.path.join(OUTPUT_DIR, "stickers.json")
-    
-    if not os.path.exists(input_file):
-        log_message(f"错误: 找不到印花输入文件 {input_file}", log_file)
-        return False
-    
-    log_message("开始翻译印花数据...", log_file)
-    
-    # 初始化印花翻译器
-    translator = StickerTranslator()
-    if not translator.load_translations():
-        log_message("印花翻译器初始化失败", log_file)
-        return False
-    
-    translator.build_index()
-    
-    # 读取输入文件
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not isinstance(data, list):
-            log_message(f"错误: 印花文件格式不正确，应为JSON数组", log_file)
-            return False
-        
-        # 翻译
-        translated_count = 0
-        total_count = len(data)
-        
-        for i, item in enumerate(data):
-            original_name = item.get('name', '')
-            translated_item = translator.translate_item(item)
-            
-            # 检查是否翻译成功
-            if translated_item.get('name', '') != original_name:
-                translated_count += 1
-            
-            # 更新原始数据
-            data[i] = translated_item
-        
-        # 保存结果
-        save_translated_data(data, output_file)
-        
-        log_message(f"✓ 印花翻译完成: {translated_count}/{total_count} 项已翻译", log_file)
-        return True
-        
-    except Exception as e:
-        log_message(f"✗ 印花翻译失败: {str(e)}", log_file)
-        return False
-
-def main():
-    start_time = time.time()
-    log_file = get_log_file()
-    
-    # 显示欢迎信息
-    log_message("=" * 60, log_file)
-    log_message("CS2 物品翻译工具 v1.0", log_file)
-    log_message("=" * 60, log_file)
-    
-    # 顺序执行各个翻译任务
-    results = {
-        "探员": translate_agents(log_file),
-        "钥匙扣": translate_keychains(log_file),
-        "音乐盒": translate_music_kits(log_file),
-        "皮肤/手套": translate_skins_gloves(log_file),
-        "印花": translate_stickers(log_file)
-    }
-    
-    # 显示总结报告
-    log_message("\n" + "=" * 60, log_file)
-    log_message("翻译任务总结:", log_file)
-    
-    success_count = sum(1 for result in results.values() if result)
-    total_count = len(results)
-    
-    for category, result in results.items():
-        status = "✓ 成功" if result else "✗ 失败"
-        log_message(f"{category}: {status}", log_file)
-    
-    elapsed_time = time.time() - start_time
-    log_message(f"\n总计: {success_count}/{total_count} 个任务成功", log_file)
-    log_message(f"总耗时: {elapsed_time:.2f} 秒", log_file)
-    log_message("=" * 60, log_file)
-    
-    return 0 if success_count == total_count else 1
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+import os
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# 导入公共模块 (探员和皮肤翻译器在用到时才导入)
+try:
+    from catalog_translator import CATEGORIES, CatalogTranslator
+    import catalog
+    import snapshot
+    from catalog import LOCALE, prefetch_catalogs
+    from jsonio import JsonArrayWriter, NotJsonArrayError, read_json_array, set_compact
+    from manifest import RowManifest, row_key
+    from batch import batched
+    import fuzzy
+    import stats
+    import runlog
+except ImportError as e:
+    print(f"错误: 无法导入翻译器模块 - {e}")
+    print("请确保所有翻译器文件(agents.py, skins.py, catalog_translator.py等)位于同一目录。")
+    sys.exit(1)
+
+# 配置
+INPUT_DIR = "."  # 默认在当前目录寻找JSON文件
+OUTPUT_DIR = "translated"  # 输出文件目录
+LOG_DIR = "logs"  # 日志目录
+CACHE_DIR = "translation_cache"  # 翻译缓存目录
+PATCH_DIR = "patches"  # 补丁目录 (--patch，见patch.py)
+
+# 输入文件对应的CSGO-API目录 (输入文件: (目录名, 超时秒数))
+CATALOGS = {
+    "agents.json": ("agents.json", 10),
+    "skins.json": ("skins.json", 30),
+    "gloves.json": ("skins.json", 30),
+}
+CATALOGS.update({config['input']: (config['catalog'], config['timeout']) for config in CATEGORIES.values()})
+
+# 监视模式: 检查输入文件变化的间隔和等待写入结束的时间 (秒)
+WATCH_INTERVAL = 0.1
+WATCH_DEBOUNCE = 0.25
+
+# 常驻模式下保留已建立索引的翻译器 ((翻译器类, 参数, 语言): 实例)，监视模式使用
+KEEP_TRANSLATORS = False
+_translators = {}
+
+# 是否在写出输出文件的同时生成与上次输出相比的补丁
+WRITE_PATCHES = False
+
+def get_log_file():
+    """生成日志文件名"""
+    return os.path.join(LOG_DIR, f"translation_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+
+def log_message(message, log_file):
+    """记录日志到文件和控制台
+
+    控制台同步输出 (与翻译器自己的输出保持顺序)，文件由runlog在后台线程写入。
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    log_message = f"[{timestamp}] {message}"
+    print(log_message)
+    runlog.get(log_file).write(log_message)
+
+def log_event(log_file, name, /, **fields):
+    """在日志文件旁的事件文件 (JSON lines) 中记录一个事件"""
+    runlog.get(log_file).event(name, **fields)
+
+def get_translator(translator_class, *args, locale=LOCALE):
+    """创建翻译器并加载目录、建立索引，失败返回None
+
+    KEEP_TRANSLATORS为True时保留实例，之后的调用直接复用已建立的索引。
+    """
+    key = (translator_class, args, locale)
+    if translator := _translators.get(key):
+        # 索引数据库中的快照被删除后 (见sqlite_index.py) 重新加载
+        if not snapshot.index_missing(translator):
+            return translator
+        del _translators[key]
+    
+    translator = translator_class(*args, locale=locale)
+    if not translator.load_translations():
+        return None
+    translator.build_index()
+    
+    if KEEP_TRANSLATORS:
+        _translators[key] = translator
+    return translator
+
+def translate_rows(rows, targets, field, log_file=None):
+    """分批翻译并写出结果，返回(各目标的已翻译数列表, 总数)
+
+    targets为 [(translate_many, 输出文件, manifest)]，每种语言一个。
+    runlog.DEBUG为True时，每个没有翻译的行在log_file的事件文件中记录一个miss事件；
+    WRITE_PATCHES为True时同时与上次的输出比较，在PATCH_DIR中为每个输出文件写出补丁。
+    rows可以是列表，也可以是流式读取的迭代器，只读取一次；每批依次交给各语言的
+    translate_many，结果逐条写入各自的输出文件。传入manifest时内容未变化的行
+    直接复用上次的翻译结果，行哈希每批只计算一次，各语言共用。
+    """
+    translated_counts = [0] * len(targets)
+    total_count = 0
+    use_manifest = any(manifest is not None for _, _, manifest in targets)
+    events = runlog.get(log_file) if log_file and runlog.DEBUG else None
+    
+    with contextlib.ExitStack() as stack:
+        writers = [stack.enter_context(JsonArrayWriter(output_file)) for _, output_file, _ in targets]
+        # 补丁在输出文件替换之前读完上次的输出
+        patches = [stack.enter_context(open_patch(output_file, field)) for _, output_file, _ in targets] if WRITE_PATCHES else None
+        for chunk in batched(rows):
+            original_names = [item.get(field, '') for item in chunk]
+            keys = [row_key(item) for item in chunk] if use_manifest else None
+            
+            for i, ((translate_many, output_file, manifest), writer) in enumerate(zip(targets, writers)):
+                # 翻译器可能直接修改输入行，除最后一种语言外都使用副本
+                items = chunk if i == len(targets) - 1 else [dict(item) for item in chunk]
+                if manifest is not None:
+                    translated_items = manifest.translate_many(items, translate_many, keys)
+                else:
+                    translated_items = translate_many(items)
+                
+                for row, (original_name, translated_item) in enumerate(zip(original_names, translated_items), total_count):
+                    # 检查是否翻译成功
+                    if translated_item.get(field, '') != original_name:
+                        translated_counts[i] += 1
+                    elif events is not None:
+                        events.debug("miss", output=output_file, row=row, name=original_name)
+                    
+                    writer.write(translated_item)
+                    if patches is not None:
+                        patches[i].add(translated_item)
+            total_count += len(chunk)
+    
+    for _, _, manifest in targets:
+        if manifest is not None:
+            manifest.save()
+    if patches is not None:
+        for patch in patches:
+            patch.save()
+            if log_file:
+                log_message(f"已写出补丁 {patch.patch_file}: {patch.changed} 行变化", log_file)
+    
+    return translated_counts, total_count
+
+def open_patch(output_file, field):
+    """返回输出文件的PatchWriter，补丁保存在PATCH_DIR中与输出目录相同的相对路径下"""
+    from patch import PATCH_SUFFIX, PatchWriter
+    from export import EXPORTS
+    relative_path = os.path.relpath(output_file, OUTPUT_DIR)
+    export = EXPORTS.get(os.path.basename(output_file))
+    return PatchWriter(output_file, os.path.join(PATCH_DIR, relative_path + PATCH_SUFFIX), relative_path, field,
+                       export[1] if export else None)
+
+def locale_outputs(locales):
+    """返回 [(语言, 输出目录, 日志后缀)]
+
+    未指定locales时只翻译默认语言，输出到OUTPUT_DIR；
+    指定时每种语言输出到OUTPUT_DIR下以语言命名的子目录。
+    """
+    if not locales:
+        return [(LOCALE, OUTPUT_DIR, "")]
+    return [(locale, os.path.join(OUTPUT_DIR, locale), f" [{locale}]") for locale in locales]
+
+def load_translators(translator_class, translator_args, label, log_file, locales):
+    """为每种语言初始化翻译器，返回 [(语言, 输出目录, 日志后缀, 翻译器)]，失败返回None"""
+    translators = []
+    for locale, output_dir, suffix in locale_outputs(locales):
+        translator = get_translator(translator_class, *translator_args, locale=locale)
+        if translator is None:
+            log_message(f"{label}翻译器初始化失败{suffix}", log_file)
+            return None
+        translators.append((locale, output_dir, suffix, translator))
+    return translators
+
+def make_targets(translators, input_name, field, incremental, **kwargs):
+    """为每种语言生成translate_rows的输出目标，kwargs传给translate_many"""
+    input_file = os.path.join(INPUT_DIR, input_name)
+    targets = []
+    for locale, output_dir, _, translator in translators:
+        os.makedirs(output_dir, exist_ok=True)
+        translate_many = partial(translator.translate_many, **kwargs) if kwargs else translator.translate_many
+        manifest = open_manifest(input_file, field, incremental, locale)
+        targets.append((translate_many, os.path.join(output_dir, input_name), manifest))
+    return targets
+
+def log_results(label, translators, targets, translated_counts, total_count, log_file, seconds):
+    """记录各语言的翻译结果和增量翻译的复用情况，seconds为translate_rows的耗时"""
+    for (locale, _, suffix, _), (_, output_file, manifest), translated_count in zip(translators, targets, translated_counts):
+        if manifest is not None:
+            log_message(f"增量翻译{suffix}: 复用 {manifest.reused} 行，重新翻译 {manifest.translated} 行", log_file)
+        log_message(f"✓ {label}翻译完成{suffix}: {translated_count}/{total_count} 项已翻译", log_file)
+        log_event(log_file, "translated", label=label, locale=locale, output=output_file, total=total_count,
+                  translated=translated_count, misses=total_count - translated_count, seconds=round(seconds, 4),
+                  reused=manifest.reused if manifest is not None else None)
+
+def open_manifest(input_file, field, incremental, locale=LOCALE):
+    """增量模式下返回输入文件的行清单，否则返回None"""
+    if not incremental:
+        return None
+    catalog_name = CATALOGS[os.path.basename(input_file)][0]
+    return RowManifest(input_file, catalog_name, field, locale)
+
+def translate_single(translator_class, translator_args, input_name, field, label, log_file, stream=False, incremental=False,
+                     locales=None):
+    """翻译只有一个输入文件的分类 (探员以及catalog_translator中配置的分类)
+
+    locales为要翻译的语言列表，输入文件只读取一次，每种语言写出各自的结果。
+    """
+    input_file = os.path.join(INPUT_DIR, input_name)
+    
+    if not os.path.exists(input_file):
+        log_message(f"错误: 找不到{label}输入文件 {input_file}", log_file)
+        return False
+    
+    log_message(f"开始翻译{label}数据...", log_file)
+    
+    # 初始化各语言的翻译器
+    translators = load_translators(translator_class, translator_args, label, log_file, locales)
+    if translators is None:
+        return False
+    
+    # 读取输入文件并翻译
+    try:
+        try:
+            data = read_json_array(input_file, stream)
+        except NotJsonArrayError:
+            log_message(f"错误: {label}文件格式不正确，应为JSON数组", log_file)
+            return False
+        
+        targets = make_targets(translators, input_name, field, incremental)
+        start = time.perf_counter()
+        translated_counts, total_count = translate_rows(data, targets, field, log_file)
+        log_results(label, translators, targets, translated_counts, total_count, log_file, time.perf_counter() - start)
+        return True
+        
+    except Exception as e:
+        log_message(f"✗ {label}翻译失败: {str(e)}", log_file)
+        return False
+
+def translate_agents(log_file, stream=False, incremental=False, locales=None):
+    """翻译探员数据"""
+    from agents import AgentTranslator
+    return translate_single(AgentTranslator, (), "agents.json", 'agent_name', "探员", log_file, stream, incremental,
+                            locales)
+
+def translate_catalog_category(category, log_file, stream=False, incremental=False, locales=None):
+    """翻译catalog_translator.CATEGORIES中配置的分类"""
+    config = CATEGORIES[category]
+    return translate_single(CatalogTranslator, (category,), config['input'], config['field'], config['label'],
+                            log_file, stream, incremental, locales)
+
+def translate_skins_gloves(log_file, stream=False, incremental=False, inputs=None, locales=None):
+    """翻译皮肤和手套数据
+
+    inputs为要处理的输入文件名列表，默认处理skins.json和gloves.json。
+    """
+    from skins import SkinGloveTranslator
+    
+    if inputs is None:
+        inputs = ["skins.json", "gloves.json"]
+    
+    skin_input_file = os.path.join(INPUT_DIR, "skins.json")
+    glove_input_file = os.path.join(INPUT_DIR, "gloves.json")
+    
+    process_skins = "skins.json" in inputs and os.path.exists(skin_input_file)
+    process_gloves = "gloves.json" in inputs and os.path.exists(glove_input_file)
+    
+    if not process_skins and not process_gloves:
+        log_message(f"错误: 找不到皮肤/手套输入文件", log_file)
+        return False
+    
+    log_message("开始翻译皮肤和手套数据...", log_file)
+    
+    # 初始化各语言的皮肤/手套翻译器
+    translators = load_translators(SkinGloveTranslator, (), "皮肤/手套", log_file, locales)
+    if translators is None:
+        return False
+    
+    # 处理皮肤文件
+    success = True
+    if process_skins:
+        try:
+            log_message("处理皮肤数据...", log_file)
+            data = read_json_array(skin_input_file, stream)
+            targets = make_targets(translators, "skins.json", 'paint_name', incremental, is_glove=False)
+            start = time.perf_counter()
+            translated_counts, total_count = translate_rows(data, targets, 'paint_name', log_file)
+            log_results("皮肤", translators, targets, translated_counts, total_count, log_file,
+                        time.perf_counter() - start)
+        except NotJsonArrayError:
+            log_message(f"错误: 皮肤文件格式不正确，应为JSON数组", log_file)
+            success = False
+        except Exception as e:
+            log_message(f"✗ 皮肤翻译失败: {str(e)}", log_file)
+            success = False
+    
+    # 处理手套文件
+    if process_gloves:
+        try:
+            log_message("处理手套数据...", log_file)
+            data = read_json_array(glove_input_file, stream)
+            targets = make_targets(translators, "gloves.json", 'paint_name', incremental, is_glove=True)
+            start = time.perf_counter()
+            translated_counts, total_count = translate_rows(data, targets, 'paint_name', log_file)
+            log_results("手套", translators, targets, translated_counts, total_count, log_file,
+                        time.perf_counter() - start)
+        except NotJsonArrayError:
+            log_message(f"错误: 手套文件格式不正确，应为JSON数组", log_file)
+            success = False
+        except Exception as e:
+            log_message(f"✗ 手套翻译失败: {str(e)}", log_file)
+            success = False
+    
+    return success
+
+def _catalog_task(category):
+    """通用翻译器分类的任务 (显示名称, (翻译函数, 输入文件))"""
+    config = CATEGORIES[category]
+    return config['label'], (partial(translate_catalog_category, category), [config['input']])
+
+# 翻译任务 (显示名称: (翻译函数, 输入文件))，字典顺序即日志输出顺序:
+# 沿用原来的探员、钥匙扣、音乐盒、皮肤/手套、印花，之后是其余分类
+TASKS = dict([
+    ("探员", (translate_agents, ["agents.json"])),
+    _catalog_task("keychains"),
+    _catalog_task("music"),
+    ("皮肤/手套", (translate_skins_gloves, ["skins.json", "gloves.json"])),
+])
+TASKS.update(_catalog_task(category) for category in CATEGORIES)
+
+# 输入文件可以不存在的任务 (不存在时不运行，也不算失败)
+OPTIONAL_TASKS = {config['label'] for config in CATEGORIES.values() if config.get('optional')}
+
+# 命令行中的分类名到任务名的映射
+CATEGORY_TASKS = {"agents": "探员", "skins": "皮肤/手套", "gloves": "皮肤/手套"}
+CATEGORY_TASKS.update({category: config['label'] for category, config in CATEGORIES.items()})
+
+# 只对应任务中部分输入文件的分类名 (其余分类名处理任务的所有输入文件)
+CATEGORY_INPUTS = {"gloves": ["gloves.json"]}
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="CS2 物品翻译工具")
+    parser.add_argument("categories", nargs="*", metavar="分类",
+                        help=f"只翻译指定的分类 ({', '.join(CATEGORY_TASKS)})，默认翻译输入文件存在的所有分类")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="并行翻译的进程数 (默认1，按顺序执行)")
+    parser.add_argument("--stream", action="store_true",
+                        help="逐条读取和写出输入数组，内存占用与文件大小无关")
+    parser.add_argument("--compact", action="store_true",
+                        help="输出不带缩进的紧凑JSON (生产环境使用，文件更小)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="只翻译与上次运行相比新增或变化的行，其余行复用上次结果")
+    parser.add_argument("--stats", action="store_true",
+                        help="统计各翻译器每个匹配层级的命中次数和耗时，结束时输出报告")
+    parser.add_argument("--fuzzy", action="store_true",
+                        help="精确匹配都失败时按名称近似匹配")
+    parser.add_argument("--fuzzy-threshold", type=float, metavar="阈值",
+                        help=f"近似匹配的相似度阈值，低于阈值的候选不采用 (0~1，默认{fuzzy.THRESHOLD})")
+    parser.add_argument("--watch", action="store_true",
+                        help="翻译完成后继续监视输入文件，文件变化时只重新翻译该文件")
+    parser.add_argument("--locales", type=lambda value: [locale.strip() for locale in value.split(",") if locale.strip()],
+                        metavar="zh-CN,zh-TW,...",
+                        help="同时翻译多种语言 (逗号分隔)，每种语言输出到 translated/<语言>/，输入文件只读取一次")
+    parser.add_argument("--bundle", metavar="文件",
+                        help="从bundle.py生成的目录包读取CSGO-API目录，不再联网下载")
+    parser.add_argument("--export-db", metavar="文件",
+                        help="翻译完成后把结果upsert到SQLite数据库的translations表 (见export.py)")
+    parser.add_argument("--export-sql", metavar="文件",
+                        help="翻译完成后生成MySQL导入文件 (translations表)")
+    parser.add_argument("--index-db", metavar="文件",
+                        help="把索引保存在SQLite数据库中并直接查询，多个进程共用同一份索引")
+    parser.add_argument("--patch", action="store_true",
+                        help=f"与上次的输出比较，在{PATCH_DIR}/中为每个输出文件写出只包含变化行的补丁 (用patch.py apply应用)")
+    parser.add_argument("--debug", action="store_true",
+                        help="在事件文件 (logs/translation_log_*.events.jsonl) 中逐条记录没有翻译的物品")
+    return parser.parse_args(argv)
+
+def active_tasks(selected=None):
+    """返回本次需要运行的任务
+
+    selected为命令行指定的分类名；未指定时只运行输入文件存在的任务，
+    一个输入文件都找不到时运行所有必需的任务，以便报告缺少哪些文件。
+    """
+    if selected:
+        labels = {CATEGORY_TASKS[name] for name in selected}
+        return [category for category in TASKS if category in labels]
+    
+    found = [
+        category for category, (_, inputs) in TASKS.items()
+        if any(os.path.exists(os.path.join(INPUT_DIR, name)) for name in inputs)
+    ]
+    return found or [category for category in TASKS if category not in OPTIONAL_TASKS]
+
+def selected_inputs(selected=None):
+    """返回命令行指定的分类只需要处理部分输入文件的任务: {任务名: 输入文件列表}
+
+    例如只指定gloves时皮肤/手套任务只处理gloves.json (与--watch中只有手套文件变化时相同)，
+    同时指定skins和gloves时处理全部输入文件，不在结果中。
+    """
+    names = {}
+    for name in selected or ():
+        category = CATEGORY_TASKS[name]
+        names.setdefault(category, set()).update(CATEGORY_INPUTS.get(name, TASKS[category][1]))
+    return {
+        category: [name for name in TASKS[category][1] if name in inputs]
+        for category, inputs in names.items() if len(inputs) < len(TASKS[category][1])
+    }
+
+def task_options(category, options, inputs):
+    """inputs (见selected_inputs) 限制了任务的输入文件时在options中加上inputs"""
+    return dict(options, inputs=inputs[category]) if category in inputs else options
+
+def task_input_size(category):
+    """统计翻译任务输入文件的总大小，用于决定调度顺序"""
+    total = 0
+    for input_name in TASKS[category][1]:
+        input_file = os.path.join(INPUT_DIR, input_name)
+        if os.path.exists(input_file):
+            total += os.path.getsize(input_file)
+    return total
+
+def run_task(category, log_file, **options):
+    """执行一个翻译任务并在事件文件中记录开始和结束，任务抛出异常时记录日志并返回False"""
+    log_event(log_file, "task_start", category=category)
+    start = time.perf_counter()
+    try:
+        result = TASKS[category][0](log_file, **options)
+    except Exception as e:
+        log_message(f"✗ {category}翻译失败: {str(e)}", log_file)
+        result = False
+    log_event(log_file, "task_finish", category=category, success=bool(result),
+              seconds=round(time.perf_counter() - start, 4))
+    return result
+
+def init_worker(compact, collect_stats, bundle_file, index_db, fuzzy_threshold, debug, write_patches):
+    """子进程初始化: 使用与主进程相同的输出格式、统计设置、目录包、索引数据库、近似匹配、调试和补丁设置"""
+    global WRITE_PATCHES
+    WRITE_PATCHES = write_patches
+    set_compact(compact)
+    runlog.set_debug(debug)
+    stats.enable(collect_stats)
+    fuzzy.enable(fuzzy_threshold is not None, fuzzy_threshold)
+    catalog.BUNDLE_FILE = bundle_file
+    snapshot.INDEX_DB = index_db
+
+def run_task_captured(category, **options):
+    """在子进程中执行翻译任务，返回结果、捕获的控制台输出、日志和事件以及匹配统计"""
+    output = io.StringIO()
+    # 进程池会复用子进程，每个任务只返回自己的统计
+    stats.reset()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        task_log_file = os.path.join(temp_dir, "task.log")
+        with contextlib.redirect_stdout(output):
+            result = run_task(category, task_log_file, **options)
+        # 等待后台线程写完日志
+        runlog.close(task_log_file)
+        
+        task_log = task_events = ""
+        if os.path.exists(task_log_file):
+            with open(task_log_file, "r", encoding="utf-8") as f:
+                task_log = f.read()
+        if os.path.exists(runlog.events_file(task_log_file)):
+            with open(runlog.events_file(task_log_file), "r", encoding="utf-8") as f:
+                task_events = f.read()
+    
+    return result, output.getvalue(), task_log, task_events, stats.snapshot()
+
+def run_tasks_parallel(jobs, log_file, categories, compact=False, inputs=None, **options):
+    """用进程池并行执行翻译任务
+
+    输入最大的任务最先提交，输出和日志仍按categories中的固定顺序写出。
+    inputs见selected_inputs。
+    """
+    schedule = sorted(categories, key=task_input_size, reverse=True)
+    results = {}
+    
+    initargs = (compact, stats.ENABLED, catalog.BUNDLE_FILE, snapshot.INDEX_DB, fuzzy.THRESHOLD if fuzzy.ENABLED else None,
+                runlog.DEBUG, WRITE_PATCHES)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=initargs) as executor:
+        futures = {category: executor.submit(run_task_captured, category, **task_options(category, options, inputs or {}))
+                   for category in schedule}
+        
+        for category in categories:
+            try:
+                result, output, task_log, task_events, task_stats = futures[category].result()
+            except Exception as e:
+                log_message(f"✗ {category}翻译进程异常退出: {str(e)}", log_file)
+                results[category] = False
+                continue
+            
+            sys.stdout.write(output)
+            runlog.get(log_file).append(task_log, task_events)
+            stats.merge(task_stats)
+            results[category] = result
+    
+    return results
+
+def input_state(input_name):
+    """返回输入文件的 (修改时间, 大小)，文件不存在时返回None"""
+    try:
+        stat = os.stat(os.path.join(INPUT_DIR, input_name))
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def retranslate(input_names, log_file, categories, **options):
+    """重新翻译发生变化的输入文件 (只运行这些文件对应的任务)"""
+    for category in categories:
+        inputs = TASKS[category][1]
+        changed = [name for name in inputs if name in input_names]
+        if not changed:
+            continue
+        
+        # 任务包含多个输入文件时只处理变化的文件
+        task_options = dict(options, inputs=changed) if len(inputs) > 1 else options
+        log_message(f"\n检测到文件变化: {', '.join(changed)}", log_file)
+        start = time.perf_counter()
+        result = run_task(category, log_file, **task_options)
+        elapsed = time.perf_counter() - start
+        status = "✓ 重新翻译完成" if result else "✗ 重新翻译失败"
+        log_message(f"{status}: {', '.join(changed)} ({elapsed * 1000:.0f} ms)", log_file)
+
+def watch_inputs(log_file, categories, inputs=None, **options):
+    """监视categories中任务的输入文件，文件变化后等待写入结束再重新翻译
+
+    文件在WATCH_DEBOUNCE秒内没有再变化才算写入结束，连续多次写入只触发一次翻译。
+    inputs见selected_inputs，其中的任务只监视列出的输入文件。
+    """
+    inputs = inputs or {}
+    input_names = [name for category in categories for name in inputs.get(category, TASKS[category][1])]
+    states = {name: input_state(name) for name in input_names}
+    pending = {}  # 文件名到最后一次变化时间的映射
+    
+    log_message(f"\n正在监视 {os.path.abspath(INPUT_DIR)} 中的输入文件 (按Ctrl+C退出)...", log_file)
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            now = time.monotonic()
+            for name in input_names:
+                state = input_state(name)
+                if state != states[name]:
+                    states[name] = state
+                    pending[name] = now
+            
+            ready = [name for name, changed_at in pending.items() if now - changed_at >= WATCH_DEBOUNCE]
+            if not ready:
+                continue
+            for name in ready:
+                del pending[name]
+            
+            # 被删除的文件保留上次的翻译结果
+            ready = [name for name in ready if states[name] is not None]
+            if ready:
+                retranslate(ready, log_file, categories, **options)
+    except KeyboardInterrupt:
+        log_message("\n已停止监视", log_file)
+
+def export_results(results, args, log_file, inputs=None):
+    """把翻译成功的分类的输出导出到数据库表 (inputs见selected_inputs)"""
+    from export import export_translations
+    inputs = inputs or {}
+    input_names = [name for category, result in results.items() if result
+                   for name in inputs.get(category, TASKS[category][1])]
+    output_dirs = [(locale, output_dir) for locale, output_dir, _ in locale_outputs(args.locales)]
+    try:
+        counts = export_translations(output_dirs, input_names, args.export_db, args.export_sql)
+    except Exception as e:
+        log_message(f"✗ 导出失败: {str(e)}", log_file)
+        return False
+    for locale, count in counts.items():
+        log_message(f"✓ 已导出 {count} 条翻译 ({locale})", log_file)
+    return True
+
+def main(argv=None):
+    args = parse_args(argv)
+    if unknown := [name for name in args.categories if name not in CATEGORY_TASKS]:
+        print(f"错误: 未知的分类 {', '.join(unknown)} (可选: {', '.join(CATEGORY_TASKS)})")
+        return 2
+    
+    start_time = time.time()
+    # 确保目录存在
+    for directory in [OUTPUT_DIR, LOG_DIR, CACHE_DIR]:
+        os.makedirs(directory, exist_ok=True)
+    log_file = get_log_file()
+    
+    # 显示欢迎信息
+    log_message("=" * 60, log_file)
+    log_message("CS2 物品翻译工具 v1.0", log_file)
+    log_message("=" * 60, log_file)
+    
+    set_compact(args.compact)
+    stats.enable(args.stats)
+    runlog.set_debug(args.debug)
+    global WRITE_PATCHES
+    WRITE_PATCHES = args.patch
+    if args.fuzzy_threshold is not None and not args.fuzzy:
+        log_message("错误: --fuzzy-threshold 需要与 --fuzzy 一起使用", log_file)
+        return 2
+    if args.fuzzy:
+        if args.fuzzy_threshold is not None and not 0 < args.fuzzy_threshold <= 1:
+            log_message("错误: 近似匹配阈值应在0到1之间", log_file)
+            return 2
+        fuzzy.enable(True, args.fuzzy_threshold)
+    if args.bundle:
+        if not os.path.exists(args.bundle):
+            log_message(f"错误: 找不到目录包 {args.bundle}", log_file)
+            return 1
+        catalog.BUNDLE_FILE = args.bundle
+        log_message(f"使用目录包: {args.bundle}", log_file)
+    if args.index_db:
+        snapshot.INDEX_DB = args.index_db
+        log_message(f"使用索引数据库: {args.index_db}", log_file)
+    options = {"stream": args.stream, "incremental": args.incremental, "locales": args.locales}
+    
+    if args.watch:
+        # 监视模式下翻译器常驻在主进程中，文件变化时不必重新加载目录和建立索引
+        global KEEP_TRANSLATORS
+        KEEP_TRANSLATORS = True
+        if args.jobs > 1:
+            log_message("监视模式下按顺序执行翻译任务 (忽略 --jobs)", log_file)
+    
+    categories = active_tasks(args.categories)
+    inputs = selected_inputs(args.categories)
+    if skipped := [category for category in TASKS if category not in categories and not args.categories]:
+        log_message(f"未找到输入文件，跳过: {', '.join(skipped)}", log_file)
+    
+    if args.jobs > 1 and not args.watch:
+        # 各分类在独立进程中翻译 (各进程自行加载目录)
+        results = run_tasks_parallel(args.jobs, log_file, categories, args.compact, inputs, **options)
+    else:
+        # 并发预取本次任务需要的目录数据，各翻译任务在自己的目录到达后立即开始
+        prefetch_catalogs(dict(
+            CATALOGS[input_name] for category in categories for input_name in inputs.get(category, TASKS[category][1])
+            if os.path.exists(os.path.join(INPUT_DIR, input_name))
+        ), args.locales or (LOCALE,))
+        
+        # 顺序执行各个翻译任务
+        results = {category: run_task(category, log_file, **task_options(category, options, inputs))
+                   for category in categories}
+    
+    # 导出失败时退出码为1 (即使所有翻译任务都成功)
+    exported = True
+    if args.export_db or args.export_sql:
+        exported = export_results(results, args, log_file, inputs)
+    
+    # 显示总结报告
+    log_message("\n" + "=" * 60, log_file)
+    log_message("翻译任务总结:", log_file)
+    
+    success_count = sum(1 for result in results.values() if result)
+    total_count = len(results)
+    
+    for category, result in results.items():
+        status = "✓ 成功" if result else "✗ 失败"
+        log_message(f"{category}: {status}", log_file)
+    if not exported:
+        log_message("导出: ✗ 失败", log_file)
+    
+    if stats.ENABLED:
+        log_message("\n匹配层级统计 (memo为批量翻译缓存，其余为translate_item的各级查找):", log_file)
+        for line in stats.summary_lines():
+            log_message(line, log_file)
+    
+    elapsed_time = time.time() - start_time
+    log_message(f"\n总计: {success_count}/{total_count} 个任务成功", log_file)
+    log_message(f"总耗时: {elapsed_time:.2f} 秒", log_file)
+    log_message("=" * 60, log_file)
+    log_event(log_file, "run_finish", success=success_count, total=total_count, exported=exported,
+              seconds=round(elapsed_time, 4))
+    
+    if args.watch:
+        # 未指定分类时监视所有输入文件 (包括之后才创建的文件)
+        watch_inputs(log_file, categories if args.categories else list(TASKS), inputs, **options)
+    
+    return 0 if success_count == total_count and exported else 1
+
+if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
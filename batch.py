@@ -0,0 +1,85 @@
+from itertools import islice
+import stats
+
+# 批量翻译时每批的行数 (流式模式下内存只与批大小有关)
+BATCH_SIZE = 1000
+# 每个TranslationMemo最多缓存的查找键数，超出时淘汰最久未使用的键；
+# None为不限制 (all.py每次运行的输入有限)，常驻的server.py需要设置
+MEMO_SIZE = None
+
+_MISSING = object()
+_UNCHANGED = object()
+
+def batched(iterable, size=BATCH_SIZE):
+    """把可迭代对象按size切分成列表"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+class TranslationMemo:
+    """按查找键缓存单行翻译的结果
+
+    translate_item只会修改field字段，因此同一查找键的所有行共享一次解析结果，
+    其余行只需把结果写回field。copy_item为True时写回到副本 (与translate_item
+    返回副本的翻译器保持一致)，否则直接修改原行。
+    name为统计中使用的翻译器名称，开启统计时记录缓存命中次数。
+    """
+
+    def __init__(self, translate_item, lookup_key, field, copy_item=False, name=None):
+        self.translate_item = translate_item
+        self.lookup_key = lookup_key
+        self.field = field
+        self.copy_item = copy_item
+        self.name = name
+        self.results = {}
+
+    def clear(self):
+        """索引变化后清空缓存"""
+        self.results.clear()
+
+    def translate(self, item, *args):
+        """翻译一行，同一查找键只调用一次translate_item"""
+        if not isinstance(item, dict):
+            return item
+
+        try:
+            key = (args, self.lookup_key(item))
+            value = self.results.get(key, _MISSING)
+        except TypeError:
+            # 字段值不可哈希 (如列表)，不做缓存
+            return self.translate_item(item, *args)
+
+        if stats.ENABLED:
+            stats.count(self.name, "memo", value is not _MISSING)
+
+        if value is _MISSING:
+            original = item.get(self.field, _MISSING)
+            result = self.translate_item(item, *args)
+            translated = result.get(self.field, _MISSING)
+            self.results[key] = _UNCHANGED if translated is _MISSING or translated == original else translated
+            if MEMO_SIZE:
+                self._evict(MEMO_SIZE)
+            return result
+
+        if MEMO_SIZE:
+            # 命中的键移到末尾，字典的插入顺序即使用顺序
+            self.results[key] = self.results.pop(key, value)
+
+        if value is _UNCHANGED:
+            return item
+        if self.copy_item:
+            item = item.copy()
+        item[self.field] = value
+        return item
+
+    def _evict(self, size):
+        """淘汰最久未使用的键直到不超过size (多个线程共用时可能同时淘汰，用pop容忍键已不存在)"""
+        while len(self.results) > size:
+            try:
+                self.results.pop(next(iter(self.results)), None)
+            except (StopIteration, RuntimeError):
+                break
+
+    def translate_many(self, items, *args):
+        """批量翻译，返回与输入顺序一致的结果列表"""
+        return [self.translate(item, *args) for item in items]
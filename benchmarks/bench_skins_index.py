@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""测量SkinGloveTranslator.build_index耗时随目录规模的变化
+
+用法: python benchmarks/bench_skins_index.py [--max-scale 10] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot
+from skins import SkinGloveTranslator
+from synthetic import SKINS_CATALOG_SIZE, make_skins_catalog
+
+def time_build_index(catalog, repeat):
+    """返回多次构建索引中的最短耗时(秒)"""
+    best = float("inf")
+    for _ in range(repeat):
+        translator = SkinGloveTranslator()
+        translator.translations = catalog
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            translator.build_index()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="build_index 规模基准测试")
+    parser.add_argument("--base", type=int, default=SKINS_CATALOG_SIZE, help="1倍规模的目录条目数")
+    parser.add_argument("--max-scale", type=int, default=10, help="最大规模倍数")
+    parser.add_argument("--repeat", type=int, default=3, help="每个规模重复次数")
+    args = parser.parse_args()
+
+    # 基准测试总是重新构建索引
+    snapshot.ENABLED = False
+
+    print(f"{'倍数':>4} {'条目数':>8} {'耗时(ms)':>10} {'每条(µs)':>10}")
+    for scale in range(1, args.max_scale + 1):
+        catalog = make_skins_catalog(args.base * scale)
+        elapsed = time_build_index(catalog, args.repeat)
+        per_item = elapsed / len(catalog) * 1e6
+        print(f"{scale:>4} {len(catalog):>8} {elapsed * 1000:>10.2f} {per_item:>10.3f}")
+
+if __name__ == "__main__":
+    main()
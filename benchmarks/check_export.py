@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""检查export.py的导出结果
+
+在临时目录中写出几个分类的翻译结果，导出到本地SQLite数据库和MySQL导入文件，确认:
+  - 重复导出是幂等的 (行数不变，名称更新为新的翻译)
+  - 各分类使用的键 (皮肤/手套为weapon_defindex_paint，探员为model路径，其余为ID)
+  - MySQL导入文件中的 ' 和 \\ 被正确转义
+
+用法: python benchmarks/check_export.py
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jsonio
+from export import export_translations
+
+# 输出文件: 翻译结果 (第二次导出时名称加上" (新)")
+OUTPUTS = {
+    "skins.json": [{"weapon_defindex": 7, "paint": 44, "paint_name": "AK-47 | 表面淬火"}],
+    "gloves.json": [{"weapon_defindex": 5030, "paint": 10018, "paint_name": "运动手套 | 迈阿密风云"}],
+    "agents.json": [{"model": "characters/models/ctm_st6/ctm_st6_variante.vmdl", "agent_name": "O'Brien \\ 海豹突击队"}],
+    "stickers.json": [{"id": "sticker-1", "name": "印花 | 'Quote' \\ Backslash"}],
+}
+
+# (分类, 键, 第一次导出的名称)
+EXPECTED = [
+    ("skins", "7_44", "AK-47 | 表面淬火"),
+    ("gloves", "5030_10018", "运动手套 | 迈阿密风云"),
+    ("agents", "characters/models/ctm_st6/ctm_st6_variante.vmdl", "O'Brien \\ 海豹突击队"),
+    ("stickers", "sticker-1", "印花 | 'Quote' \\ Backslash"),
+]
+
+NAME_FIELDS = {"skins.json": "paint_name", "gloves.json": "paint_name", "agents.json": "agent_name",
+               "stickers.json": "name"}
+
+def write_outputs(output_dir, suffix=""):
+    for name, rows in OUTPUTS.items():
+        field = NAME_FIELDS[name]
+        jsonio.dump([dict(row, **{field: row[field] + suffix}) for row in rows], os.path.join(output_dir, name))
+
+def read_rows(db_file):
+    with sqlite3.connect(db_file) as connection:
+        return sorted(connection.execute("SELECT category, key, locale, name FROM translations"))
+
+def main():
+    problems = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_file = os.path.join(temp_dir, "translations.db")
+        sql_file = os.path.join(temp_dir, "translations.sql")
+        output_dirs = [("zh-CN", temp_dir)]
+
+        write_outputs(temp_dir)
+        export_translations(output_dirs, list(OUTPUTS), db_file, sql_file)
+        expected = sorted((category, key, "zh-CN", name) for category, key, name in EXPECTED)
+        if read_rows(db_file) != expected:
+            problems.append(f"第一次导出的行为 {read_rows(db_file)}，应为 {expected}")
+
+        # 第二次导出同样的键: 行数不变，名称被更新
+        write_outputs(temp_dir, " (新)")
+        export_translations(output_dirs, list(OUTPUTS), db_file)
+        expected = sorted((category, key, "zh-CN", name + " (新)") for category, key, name in EXPECTED)
+        if read_rows(db_file) != expected:
+            problems.append(f"重复导出后的行为 {read_rows(db_file)}，应为 {expected}")
+
+        with open(sql_file, encoding="utf-8") as f:
+            dump = f.read()
+        for literal in ("'O\\'Brien \\\\ 海豹突击队'", "'印花 | \\'Quote\\' \\\\ Backslash'", "'7_44'"):
+            if literal not in dump:
+                problems.append(f"MySQL导入文件中没有 {literal}")
+
+    for problem in problems:
+        print(f"✗ {problem}")
+    if not problems:
+        print(f"✓ {len(EXPECTED)} 个分类的导出正确 (upsert幂等、键、MySQL转义)")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""检查非默认语言目录的分类前缀识别
+
+用合成目录 (音乐盒目录中普通和StatTrak条目各一半) 模拟zh-TW目录，确认各分类都能
+识别出前缀，并且翻译结果与zh-CN一样去掉了前缀。
+
+用法: python benchmarks/check_locales.py
+"""
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot
+from catalog_translator import CATEGORIES, CatalogTranslator
+from synthetic import make_keychains_catalog, make_music_kits_catalog, make_stickers_catalog
+
+# (分类, 合成目录, zh-CN前缀, 模拟的zh-TW前缀)
+CASES = [
+    ("stickers", make_stickers_catalog(200), "印花 | ", "印花 | "),
+    ("keychains", make_keychains_catalog(100), "挂件 | ", "掛件 | "),
+    ("music", make_music_kits_catalog(200), "音乐盒 | ", "音樂盒 | "),
+]
+
+def to_locale(catalog, zh_prefix, locale_prefix):
+    """把目录名称中的zh-CN前缀替换为其他语言的前缀"""
+    return [dict(entry, name=entry['name'].replace(zh_prefix, locale_prefix)) for entry in catalog]
+
+def check_case(category, catalog, zh_prefix, locale_prefix):
+    """返回发现的问题列表"""
+    translator = CatalogTranslator(category, locale="zh-TW")
+    translator.translations = to_locale(catalog, zh_prefix, locale_prefix)
+    with contextlib.redirect_stdout(io.StringIO()):
+        translator.build_index()
+    if translator.prefix != locale_prefix:
+        return [f"{category}: 识别出的前缀为 {translator.prefix!r}，应为 {locale_prefix!r}"]
+
+    problems = []
+    field = CATEGORIES[category]['field']
+    for entry in catalog[:20]:
+        item = translator.translate_item({'id': entry['id'], field: ''})
+        if locale_prefix in item[field]:
+            problems.append(f"{category}: {entry['id']} 的翻译结果 {item[field]!r} 仍带有前缀")
+    return problems
+
+def main():
+    # 总是重新构建索引
+    snapshot.ENABLED = False
+    problems = []
+    for case in CASES:
+        problems.extend(check_case(*case))
+    for problem in problems:
+        print(f"✗ {problem}")
+    if not problems:
+        print(f"✓ {len(CASES)} 个分类的前缀识别正确")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""本地HTTP服务，代替CSGO-API提供合成目录数据 (基准测试不需要联网)"""
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class _CatalogHandler(BaseHTTPRequestHandler):
+    """处理 GET /api/<语言>/<目录名>，支持ETag条件请求"""
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        prefix, _, name = self.path.partition('?')[0].rpartition('/')
+        entry = server.catalogs.get(name) if prefix.startswith('/api/') else None
+        if entry is None:
+            self.send_error(404)
+            return
+
+        content, etag = entry
+        server.requests += 1
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        # 不输出访问日志，避免干扰测试结果
+        pass
+
+class CatalogServer:
+    """在后台线程中运行的目录服务
+
+    catalogs为{目录名: JSON字节串}，latency为每个请求的额外延迟(秒)。
+    端口由系统分配，通过api_root获取地址。
+    """
+
+    def __init__(self, catalogs, latency=0.0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _CatalogHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.requests = 0
+        self.httpd.catalogs = {}
+        for name, content in catalogs.items():
+            self.set_catalog(name, content)
+        self.thread = None
+
+    @property
+    def api_root(self):
+        """与catalog.API_ROOT格式相同的地址"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    @property
+    def requests(self):
+        """已处理的目录请求数"""
+        return self.httpd.requests
+
+    def set_catalog(self, name, content):
+        """设置或更新一个目录，ETag随内容变化"""
+        etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+        self.httpd.catalogs[name] = (content, etag)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""完整流程基准测试: 下载、解析、建索引、翻译、写出
+
+合成目录由本地HTTP服务提供，不需要联网。结果可保存为JSON，用于对比两次运行。
+
+用法: python benchmarks/run.py [--scale 1] [--rows 20000] [--latency 0.05]
+                              [--repeat 3] [--output result.json] [--compare old.json]
+"""
+import argparse
+import contextlib
+import copy
+import io
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import catalog
+import jsonio
+import snapshot
+from agents import AgentTranslator
+from keychains import KeychainTranslator
+from music import MusicKitTranslator
+from skins import SkinGloveTranslator
+from stickers import StickerTranslator
+from http_stub import CatalogServer
+from synthetic import make_catalogs, make_inputs
+
+# (名称, 翻译器类, 目录名, 输入文件, translate_many的额外参数)
+TARGETS = [
+    ("agents", AgentTranslator, "agents.json", "agents.json", {}),
+    ("skins", SkinGloveTranslator, "skins.json", "skins.json", {"is_glove": False}),
+    ("gloves", SkinGloveTranslator, "skins.json", "gloves.json", {"is_glove": True}),
+    ("stickers", StickerTranslator, "stickers.json", "stickers.json", {}),
+    ("keychains", KeychainTranslator, "keychains.json", "keychains.json", {}),
+    ("music", MusicKitTranslator, "music_kits.json", "music.json", {}),
+]
+
+STAGES = ["fetch", "parse", "load_cold", "load_304", "build_index", "snapshot_restore", "translate", "dump"]
+
+def _clear_cache(name):
+    """删除目录缓存，使下一次加载重新下载"""
+    for path in (os.path.join(catalog.CACHE_DIR, name), os.path.join(catalog.CACHE_DIR, name + ".meta")):
+        if os.path.exists(path):
+            os.remove(path)
+
+def _timed(func, *args, **kwargs):
+    """执行函数并返回 (结果, 耗时秒数)，屏蔽其输出"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return result, elapsed
+
+def run_target(translator_class, catalog_name, rows, kwargs):
+    """对一个翻译器执行一轮完整流程，返回各阶段耗时和计数"""
+    timings = {}
+
+    # 原始下载和解析分开计时
+    response, timings["fetch"] = _timed(catalog.get_session().get, catalog.catalog_url(catalog_name), timeout=30)
+    response.raise_for_status()
+    _, timings["parse"] = _timed(jsonio.loads, response.content)
+
+    # 经过缓存层加载: 首次下载并写缓存，第二次走304 (关闭快照，否则目录未变化时不会解析)
+    snapshot.ENABLED = False
+    _clear_cache(catalog_name)
+    translator = translator_class()
+    _, timings["load_cold"] = _timed(translator.load_translations)
+    translator = translator_class()
+    _, timings["load_304"] = _timed(translator.load_translations)
+    # build_index之后翻译器会释放原始目录，先保留一份给快照恢复使用
+    catalog_data = translator.translations
+
+    _, timings["build_index"] = _timed(translator.build_index)
+
+    # 第一次构建会保存快照，第二次才是从快照恢复的耗时
+    snapshot.ENABLED = True
+    for _ in range(2):
+        restored = translator_class()
+        restored.translations = catalog_data
+        _, timings["snapshot_restore"] = _timed(restored.build_index)
+
+    items = copy.deepcopy(rows)
+    results, timings["translate"] = _timed(translator.translate_many, items, **kwargs)
+    output_file = f"bench_{translator_class.__name__}.json"
+    _, timings["dump"] = _timed(jsonio.dump, results, output_file)
+
+    changed = sum(1 for before, after in zip(rows, results) if before != after)
+    counts = {
+        "catalog_items": len(catalog_data),
+        "rows": len(rows),
+        "translated_rows": changed,
+    }
+    return timings, counts
+
+def run_benchmark(args):
+    """生成数据、启动本地服务并测量所有翻译器，返回结果字典"""
+    catalogs = make_catalogs(args.scale, args.seed)
+    inputs = make_inputs(args.rows, args.seed)
+    payloads = {name: jsonio.dumps(data, compact=True).encode("utf-8") for name, data in catalogs.items()}
+
+    workdir = tempfile.mkdtemp(prefix="wp-bench-")
+    old_cwd, old_root = os.getcwd(), catalog.API_ROOT
+    results = {}
+    try:
+        os.chdir(workdir)
+        with CatalogServer(payloads, latency=args.latency) as server:
+            catalog.API_ROOT = server.api_root
+            for label, translator_class, catalog_name, input_file, kwargs in TARGETS:
+                best = {}
+                for _ in range(args.repeat):
+                    timings, counts = run_target(translator_class, catalog_name, inputs[input_file], kwargs)
+                    for stage, elapsed in timings.items():
+                        best[stage] = min(best.get(stage, float("inf")), elapsed)
+                results[label] = {
+                    "catalog": catalog_name,
+                    "catalog_bytes": len(payloads[catalog_name]),
+                    **counts,
+                    "seconds": {stage: best[stage] for stage in STAGES},
+                }
+    finally:
+        catalog.API_ROOT = old_root
+        snapshot.ENABLED = True
+        os.chdir(old_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": jsonio.BACKEND,
+            "scale": args.scale,
+            "rows": args.rows,
+            "latency": args.latency,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+def print_report(report, baseline=None):
+    """打印各阶段耗时(ms)，提供baseline时附加与其的比值"""
+    header = f"{'翻译器':<10}" + "".join(f"{stage:>17}" for stage in STAGES)
+    print(header)
+    for label, result in report["results"].items():
+        cells = []
+        for stage in STAGES:
+            elapsed = result["seconds"][stage] * 1000
+            cell = f"{elapsed:.2f}"
+            old = (baseline or {}).get("results", {}).get(label, {}).get("seconds", {}).get(stage)
+            if old:
+                cell += f" ({elapsed / (old * 1000):.2f}x)"
+            cells.append(f"{cell:>17}")
+        print(f"{label:<10}" + "".join(cells))
+
+def main():
+    parser = argparse.ArgumentParser(description="翻译流程基准测试 (不需要联网)")
+    parser.add_argument("--scale", type=float, default=1, help="目录规模倍数 (1倍约等于当前CSGO-API)")
+    parser.add_argument("--rows", type=int, default=20000, help="皮肤和印花输入文件的行数")
+    parser.add_argument("--latency", type=float, default=0.0, help="本地服务每个请求的额外延迟(秒)")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，每个阶段取最短耗时")
+    parser.add_argument("--seed", type=int, default=0, help="合成数据的随机种子")
+    parser.add_argument("--output", help="把结果保存为JSON文件")
+    parser.add_argument("--compare", help="与之前保存的JSON结果对比")
+    args = parser.parse_args()
+
+    baseline = jsonio.load(args.compare) if args.compare else None
+    report = run_benchmark(args)
+    print_report(report, baseline)
+
+    if args.output:
+        jsonio.dump(report, args.output)
+        print(f"\n结果已保存到: {args.output}")
+
+if __name__ == "__main__":
+    main()
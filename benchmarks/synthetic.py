@@ -0,0 +1,199 @@
+"""生成与CSGO-API结构相同的合成目录数据，供基准测试使用"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skins import BASIC_WEAPON_MAP
+
+# 当前CSGO-API zh-CN skins.json的大致条目数
+SKINS_CATALOG_SIZE = 2000
+
+# 其他目录在1倍规模下的大致条目数
+CATALOG_SIZES = {
+    "skins.json": SKINS_CATALOG_SIZE,
+    "stickers.json": 8000,
+    "keychains.json": 100,
+    "music_kits.json": 200,
+    "agents.json": 60,
+}
+
+GLOVES = [
+    (5027, "studded_bloodhound_gloves", "血猎手套", "Bloodhound Gloves"),
+    (5030, "sporty_gloves", "运动手套", "Sport Gloves"),
+    (5031, "slick_gloves", "驾驶手套", "Driver Gloves"),
+    (5033, "motorcycle_gloves", "摩托手套", "Moto Gloves"),
+    (5034, "specialist_gloves", "专业手套", "Specialist Gloves"),
+    (5035, "studded_hydra_gloves", "九头蛇手套", "Hydra Gloves"),
+    (4725, "studded_brokenfang_gloves", "狂牙手套", "Broken Fang Gloves"),
+]
+
+def _weapons():
+    """生成武器列表 (weapon_id, 武器代码, 中文名, 分类, 英文名)"""
+    weapons = []
+    for i, (en_name, zh_name) in enumerate(BASIC_WEAPON_MAP.items(), 1):
+        code = "weapon_" + en_name.lower().replace(" ", "_").replace("-", "")
+        category = "knife" if "Knife" in en_name or "Bayonet" in en_name or "Karambit" in en_name else "rifles"
+        weapon_id = 500 + i if category == "knife" else i
+        weapons.append((weapon_id, code, zh_name, category, en_name))
+    for weapon_id, code, zh_name, en_name in GLOVES:
+        weapons.append((weapon_id, code, zh_name, "sfui_invpanel_filter_gloves", en_name))
+    return weapons
+
+def make_skins_catalog(count, seed=0):
+    """生成count条skins.json格式的条目"""
+    rng = random.Random(seed)
+    weapons = _weapons()
+    catalog = []
+    for i in range(count):
+        weapon_id, code, zh_name, category, _ = weapons[i % len(weapons)]
+        paint_index = i // len(weapons) + 1
+        pattern_name = f"图案{paint_index}"
+        star = "（★）" if category != "rifles" else ""
+        catalog.append({
+            "id": f"skin-{weapon_id}_{paint_index}",
+            "name": f"{zh_name}{star} | {pattern_name}",
+            "description": "合成描述" * rng.randint(5, 20),
+            "weapon": {"id": code, "weapon_id": weapon_id, "name": zh_name},
+            "category": {"id": category, "name": category},
+            "pattern": {"id": f"pattern_{paint_index}", "name": pattern_name},
+            "min_float": 0.0,
+            "max_float": 1.0,
+            "rarity": {"id": "rarity_rare_weapon", "name": "军规级", "color": "#4b69ff"},
+            "stattrak": rng.random() < 0.5,
+            "paint_index": str(paint_index),
+            "image": f"https://example.invalid/{code}_{paint_index}.png",
+        })
+    return catalog
+
+def make_stickers_catalog(count, seed=0):
+    """生成count条stickers.json格式的条目"""
+    rng = random.Random(seed)
+    return [{
+        "id": f"sticker-{i}",
+        "name": f"印花 | 合成印花{i}" + (" (全息)" if i % 4 == 0 else ""),
+        "description": "合成描述" * rng.randint(2, 10),
+        "rarity": {"id": "rarity_rare", "name": "高级", "color": "#4b69ff"},
+        "crates": [{"id": f"crate-{i % 50}", "name": f"胶囊{i % 50}"}],
+        "tournament_event": "",
+        "type": "Event" if i % 3 else "Team",
+        "image": f"https://example.invalid/sticker_{i}.png",
+    } for i in range(1, count + 1)]
+
+def make_keychains_catalog(count, seed=0):
+    """生成count条keychains.json格式的条目"""
+    rng = random.Random(seed)
+    return [{
+        "id": f"keychain-{i}",
+        "name": f"挂件 | 合成挂件{i}",
+        "description": "合成描述" * rng.randint(2, 10),
+        "rarity": {"id": "rarity_rare", "name": "高级", "color": "#4b69ff"},
+        "image": f"https://example.invalid/keychain_{i}.png",
+    } for i in range(1, count + 1)]
+
+def make_music_kits_catalog(count, seed=0):
+    """生成count条music_kits.json格式的条目 (普通和StatTrak各一半)"""
+    catalog = []
+    for i in range(1, count // 2 + 1):
+        catalog.append({
+            "id": f"music_kit-{i}",
+            "name": f"音乐盒 | 艺术家{i}, 曲目{i}",
+            "market_hash_name": f"Music Kit | Artist{i}, Track{i}",
+            "image": f"https://example.invalid/music_{i}.png",
+        })
+        catalog.append({
+            "id": f"music_kit-{i}_st",
+            "name": f"StatTrak™ 音乐盒 | 艺术家{i}, 曲目{i}",
+            "market_hash_name": f"StatTrak™ Music Kit | Artist{i}, Track{i}",
+            "image": f"https://example.invalid/music_{i}.png",
+        })
+    return catalog
+
+def make_agents_catalog(count, seed=0):
+    """生成count条agents.json格式的条目"""
+    return [{
+        "id": f"agent-{i}",
+        "name": f"合成探员{i} | 合成部队{i % 10}",
+        "description": "合成描述",
+        "market_hash_name": f"'Agent{i}' Operator{i} | Unit{i % 10}",
+        "model_player": f"characters\\models\\synthetic\\agent_{i}.vmdl",
+        "image": f"https://example.invalid/agent_{i}.png",
+    } for i in range(1, count + 1)]
+
+CATALOG_MAKERS = {
+    "skins.json": make_skins_catalog,
+    "stickers.json": make_stickers_catalog,
+    "keychains.json": make_keychains_catalog,
+    "music_kits.json": make_music_kits_catalog,
+    "agents.json": make_agents_catalog,
+}
+
+def make_catalogs(scale=1, seed=0):
+    """按规模倍数生成所有目录，返回{目录名: 条目列表}"""
+    return {name: maker(int(CATALOG_SIZES[name] * scale), seed) for name, maker in CATALOG_MAKERS.items()}
+
+def make_weapon_rows(count, gloves, seed=0):
+    """生成WeaponPaints skins.json/gloves.json格式的输入行
+
+    大约5%的行是 "| Default" 默认皮肤，2%的行找不到对应翻译。
+    """
+    rng = random.Random(seed)
+    weapons = [w for w in _weapons() if (w[3] == "sfui_invpanel_filter_gloves") == gloves]
+    rows = []
+    for _ in range(count):
+        weapon_id, code, _, category, en_name = rng.choice(weapons)
+        star = "★ " if category != "rifles" else ""
+        roll = rng.random()
+        if roll < 0.05:
+            paint, paint_name = 0, f"{star}{en_name} | Default"
+        elif roll < 0.07:
+            paint, paint_name = 99999, f"{star}{en_name} | Unknown Pattern"
+        else:
+            paint_index = rng.randint(1, max(1, SKINS_CATALOG_SIZE // len(_weapons())))
+            paint, paint_name = str(paint_index), f"{star}{en_name} | Pattern {paint_index}"
+        rows.append({
+            "weapon_defindex": weapon_id,
+            "weapon_name": code,
+            "paint": paint,
+            "image": f"https://example.invalid/{code}.png",
+            "paint_name": paint_name,
+            "legacy_model": False,
+        })
+    return rows
+
+def make_inputs(rows, seed=0):
+    """生成六个WeaponPaints输入文件的内容，返回{文件名: 行列表}
+
+    rows为皮肤和印花文件的行数，其他文件按比例缩小。
+    """
+    rng = random.Random(seed)
+    sticker_count = max(1, rows)
+    keychain_count = max(1, rows // 20)
+    music_count = max(1, rows // 20)
+    agent_count = max(1, rows // 40)
+    return {
+        "skins.json": make_weapon_rows(rows, gloves=False, seed=seed),
+        "gloves.json": make_weapon_rows(max(1, rows // 10), gloves=True, seed=seed),
+        "stickers.json": [{
+            "id": str(rng.randint(1, CATALOG_SIZES["stickers.json"])),
+            "name": f"Sticker | Synthetic {i}",
+            "image": "https://example.invalid/sticker.png",
+        } for i in range(sticker_count)],
+        "keychains.json": [{
+            "id": str(rng.randint(1, CATALOG_SIZES["keychains.json"])),
+            "name": f"Keychain | Synthetic {i}",
+            "image": "https://example.invalid/keychain.png",
+        } for i in range(keychain_count)],
+        "music.json": [{
+            "id": str(rng.randint(1, CATALOG_SIZES["music_kits.json"] // 2)),
+            "name": f"Artist{i}, Track{i}",
+            "image": "https://example.invalid/music.png",
+        } for i in range(music_count)],
+        "agents.json": [{
+            "model": f"characters/models/synthetic/agent_{rng.randint(1, CATALOG_SIZES['agents.json'])}.vmdl",
+            "agent_name": f"'Agent{i}' Operator{i} | Unit{i % 10}",
+            "team": 2 + i % 2,
+            "image": "https://example.invalid/agent.png",
+        } for i in range(agent_count)],
+    }
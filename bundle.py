@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""CSGO-API目录包
+
+把翻译器使用的所有目录打包成一个压缩文件，并为每个翻译器预先建立好查找表。
+翻译器通过内存映射读取目录包，打开时只解析文件头；恢复索引时 (见snapshot.py)
+直接使用目录包中的查找表，每次查找只读取内存映射中的一条记录，不解压也不解析目录，
+启动时间和内存占用不随目录大小增长。目录包中没有对应的查找表时 (如用旧代码打包)
+才逐块解压条目建立索引，任何时刻只有一个块处于解析后的状态。
+目录包也可以直接复制到不能联网的服务器上使用。
+
+文件格式 (整数均为小端):
+  MAGIC (8字节) | 版本 (uint32) | 文件头长度 (uint32) | 文件头JSON | 数据区
+  文件头记录每个目录的语言、名称、SHA-256、条目数以及块表在数据区中的位置，
+  以及每个翻译器索引 (类型、目录SHA-256、快照版本) 的各属性: 标量直接保存在文件头中，
+  dict属性为查找表在数据区中的位置 (嵌套的dict每个子表一张查找表)。
+  每个目录的条目按BLOCK_ENTRIES个一组压缩成块 (zlib压缩的JSON数组)，
+  块表为每块的 (偏移, 长度)。
+  查找表: 槽数 (uint32, 2的幂) | 条目数 (uint32) | 槽 (uint32 × 槽数) | 记录
+  槽为记录相对于查找表开头的偏移 (0为空槽)，按键的CRC32开放寻址；
+  记录为 键长度 (uint32) | 值长度 (uint32) | 键 | 值，键和值编码为类型标记 (s/i) 加内容。
+
+用法:
+  python bundle.py build [-o catalogs.bundle] [--locales zh-CN,zh-TW]  下载目录并打包
+  python bundle.py info catalogs.bundle                                显示目录包内容
+之后运行 all.py --bundle catalogs.bundle 即从目录包加载目录，不再联网。
+"""
+import os
+import sys
+import mmap
+import time
+import zlib
+import struct
+import hashlib
+import argparse
+import threading
+
+import catalog
+import jsonio
+from catalog import LOCALE
+from catalog_translator import CATEGORIES
+
+MAGIC = b"CS2WPBN\0"
+# 目录包格式版本，格式变化时递增，旧版本的目录包会被拒绝
+BUNDLE_VERSION = 3
+# 每个压缩块包含的条目数 (越大压缩率越高)
+BLOCK_ENTRIES = 64
+
+_PREAMBLE = struct.Struct("<8sII")
+_BLOCK = struct.Struct("<QI")   # 块在数据区中的偏移, 压缩后长度
+_TABLE = struct.Struct("<II")   # 查找表的槽数, 条目数
+_SLOT = struct.Struct("<I")     # 记录相对于查找表开头的偏移
+_RECORD = struct.Struct("<II")  # 键长度, 值长度
+
+# 需要打包的目录 (目录名: 下载超时秒数)
+CATALOGS = {"agents.json": 10, "skins.json": 30}
+CATALOGS.update({config['catalog']: config['timeout'] for config in CATEGORIES.values()})
+
+_bundles = {}  # 路径到 (文件修改时间和大小, 已打开的目录包) 的映射
+_bundles_lock = threading.Lock()
+_MISSING = object()
+_EMPTY = {}  # 嵌套索引中不存在的子索引
+
+class BundleError(ValueError):
+    """目录包格式不正确或不包含请求的目录"""
+
+def _pack_catalog(entries, data):
+    """把一个目录的条目追加到数据区data (bytearray)，返回文件头中的描述 (不含名称等字段)"""
+    block_table = bytearray()
+    for start in range(0, len(entries), BLOCK_ENTRIES):
+        block = zlib.compress(jsonio.dumps(entries[start:start + BLOCK_ENTRIES], compact=True).encode('utf-8'), 9)
+        block_table += _BLOCK.pack(len(data), len(block))
+        data += block
+
+    blocks_offset = len(data)
+    data += block_table
+    return {
+        "count": len(entries),
+        "blocks_offset": blocks_offset,
+        "blocks": len(block_table) // _BLOCK.size,
+    }
+
+def _encode(value):
+    """查找表中键和值的二进制表示，只支持str和int (bool按int处理，与dict的键相同)"""
+    if isinstance(value, str):
+        return b's' + value.encode('utf-8')
+    if isinstance(value, int):
+        return b'i' + str(int(value)).encode('ascii')
+    raise TypeError(f"查找表不支持 {type(value).__name__} 类型")
+
+def _decode(data):
+    """_encode的逆操作 (data为内存映射中的memoryview)"""
+    if data[0] == ord('s'):
+        return str(data[1:], 'utf-8')
+    return int(bytes(data[1:]))
+
+def _pack_table(table, data):
+    """把一个dict写成查找表追加到data，返回查找表在数据区中的位置"""
+    records = []
+    for key, value in table.items():
+        if isinstance(value, bool):
+            raise TypeError("查找表不支持 bool 类型的值")
+        records.append((_encode(key), _encode(value)))
+
+    slot_count = 1
+    while slot_count < 2 * len(records):
+        slot_count *= 2
+    slots = [0] * slot_count
+    body = bytearray()
+    records_offset = _TABLE.size + slot_count * _SLOT.size
+    for key, value in records:
+        slot = zlib.crc32(key) & (slot_count - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = records_offset + len(body)
+        body += _RECORD.pack(len(key), len(value)) + key + value
+
+    offset = len(data)
+    data += _TABLE.pack(slot_count, len(records))
+    data += struct.pack(f"<{slot_count}I", *slots)
+    data += body
+    return offset
+
+def _index_translators(name, locale):
+    """返回使用目录name的翻译器及其需要保存的索引属性 [(翻译器, 属性名)]"""
+    import agents
+    import skins
+    import catalog_translator
+    if name == "agents.json":
+        return [(agents.AgentTranslator(locale=locale), agents.INDEX_ATTRS)]
+    if name == "skins.json":
+        return [(skins.SkinGloveTranslator(locale=locale), skins.INDEX_ATTRS)]
+    return [(catalog_translator.CatalogTranslator(category, locale=locale), catalog_translator.INDEX_ATTRS)
+            for category, config in CATEGORIES.items() if config['catalog'] == name]
+
+def _pack_indexes(locale, name, entries, digest, data):
+    """为使用该目录的翻译器建立索引并写成查找表，返回文件头中的描述列表
+
+    属性不能写成查找表时 (键或值的类型不支持、标量不能写成JSON) 跳过该翻译器，
+    运行时照常从目录建立索引。
+    """
+    import snapshot
+    from sqlite_index import attr_layout
+    descriptions = []
+    for translator, attrs in _index_translators(name, locale):
+        translator.translations = entries
+        translator.build_index()
+        try:
+            packed = {}
+            for attr in attrs:
+                value = getattr(translator, attr)
+                layout = attr_layout(value)
+                if layout == 'nested':
+                    packed[attr] = ['nested', {sub: _pack_table(table, data) for sub, table in value.items()}]
+                elif layout == 'flat':
+                    packed[attr] = ['flat', _pack_table(value, data)]
+                else:
+                    jsonio.dumps(value, compact=True)
+                    packed[attr] = ['scalar', value]
+        except (TypeError, ValueError) as e:
+            print(f"! {locale}/{name} 的 {type(translator).__name__} 索引不能打包 ({str(e)})，运行时从目录建立")
+            continue
+        descriptions.append({
+            "kind": snapshot.index_kind(translator),
+            "digest": digest,
+            "version": snapshot.SNAPSHOT_VERSION,
+            "attrs": packed,
+        })
+    return descriptions
+
+def build_bundle(catalogs, output_file, api_root=None):
+    """把目录和各翻译器的查找表打包写入output_file
+
+    catalogs为 [(语言, 目录名, 原始JSON字节)]。
+    """
+    import snapshot
+    data = bytearray()
+    descriptions = []
+    indexes = []
+    # 打包时总是从目录建立索引，不读写索引快照
+    snapshot_enabled, snapshot.ENABLED = snapshot.ENABLED, False
+    try:
+        for locale, name, content in catalogs:
+            entries = jsonio.loads(content)
+            if not isinstance(entries, list):
+                raise BundleError(f"{locale}/{name} 不是JSON数组")
+            digest = hashlib.sha256(content).hexdigest()
+            description = _pack_catalog(entries, data)
+            descriptions.append({
+                "locale": locale,
+                "name": name,
+                "sha256": digest,
+                **description,
+            })
+            indexes.extend(_pack_indexes(locale, name, entries, digest, data))
+    finally:
+        snapshot.ENABLED = snapshot_enabled
+
+    header = jsonio.dumps({
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "api_root": api_root,
+        "block_entries": BLOCK_ENTRIES,
+        "catalogs": descriptions,
+        "indexes": indexes,
+    }, compact=True).encode('utf-8')
+    catalog.write_atomic(output_file, _PREAMBLE.pack(MAGIC, BUNDLE_VERSION, len(header)) + header + bytes(data))
+
+class BundleCatalog:
+    """目录包中的一个目录，可以像列表一样迭代 (有长度)
+
+    迭代时逐块解压，任何时刻只有一个块处于解析后的状态。
+    """
+
+    def __init__(self, bundle, description):
+        self.bundle = bundle
+        self.name = description['name']
+        self.locale = description['locale']
+        self.sha256 = description['sha256']
+        self.count = description['count']
+        self.blocks_offset = description['blocks_offset']
+        self.blocks = description['blocks']
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for block_number in range(self.blocks):
+            yield from self._read_block(block_number)
+
+    def _read_block(self, block_number):
+        """解压并解析一个块"""
+        offset, length = _BLOCK.unpack_from(self.bundle.view, self.blocks_offset + block_number * _BLOCK.size)
+        offset += self.bundle.data_offset
+        return jsonio.loads(zlib.decompress(self.bundle.view[offset:offset + length]))
+
+class BundleTable:
+    """目录包中一张查找表的只读视图，接口与dict的读取方法相同
+
+    数据不加载到内存，每次get在内存映射中按键的CRC32查找一条记录，
+    多个进程通过系统页缓存共享同一份查找表。
+    """
+
+    def __init__(self, bundle, offset):
+        self.bundle = bundle
+        self.offset = offset
+        self.slot_count, self.count = _TABLE.unpack_from(bundle.view, offset)
+        self.slots_offset = offset + _TABLE.size
+
+    def get(self, key, default=None):
+        try:
+            encoded = _encode(key)
+        except TypeError:
+            # 查找表中只有str和int的键，与dict中找不到相同
+            return default
+        view = self.bundle.view
+        mask = self.slot_count - 1
+        slot = zlib.crc32(encoded) & mask
+        while True:
+            record, = _SLOT.unpack_from(view, self.slots_offset + slot * _SLOT.size)
+            if not record:
+                return default
+            start = self.offset + record
+            key_length, value_length = _RECORD.unpack_from(view, start)
+            start += _RECORD.size
+            if key_length == len(encoded) and view[start:start + key_length] == encoded:
+                start += key_length
+                return _decode(view[start:start + value_length])
+            slot = (slot + 1) & mask
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return self.count
+
+    def items(self):
+        """按写入顺序依次产出 (键, 值)"""
+        view = self.bundle.view
+        start = self.slots_offset + self.slot_count * _SLOT.size
+        for _ in range(self.count):
+            key_length, value_length = _RECORD.unpack_from(view, start)
+            start += _RECORD.size
+            key = _decode(view[start:start + key_length])
+            start += key_length
+            yield key, _decode(view[start:start + value_length])
+            start += value_length
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def keys(self):
+        return iter(self)
+
+class BundleTables:
+    """嵌套索引 (如 index['weapon_paint']) 的视图，不存在的子索引返回空表 (与defaultdict(dict)相同)"""
+
+    def __init__(self, tables):
+        self.tables = tables  # 子索引名到BundleTable的映射
+
+    def __getitem__(self, sub):
+        return self.tables.get(sub, _EMPTY)
+
+    def get(self, sub, default=None):
+        return self.tables.get(sub, default)
+
+    def __contains__(self, sub):
+        return sub in self.tables
+
+    def __iter__(self):
+        return iter(self.tables)
+
+    def __len__(self):
+        return len(self.tables)
+
+    def items(self):
+        return list(self.tables.items())
+
+class Bundle:
+    """内存映射的目录包"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self._mmap)
+
+        if len(self._mmap) < _PREAMBLE.size:
+            raise BundleError(f"{path} 不是目录包")
+        magic, version, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise BundleError(f"{path} 不是目录包")
+        if version != BUNDLE_VERSION:
+            raise BundleError(f"{path} 的格式版本为 {version}，当前只支持版本 {BUNDLE_VERSION}，请重新打包")
+
+        # 文件头中的位置都相对于数据区开头
+        self.data_offset = data_offset = _PREAMBLE.size + header_length
+        self.header = jsonio.loads(self._mmap[_PREAMBLE.size:data_offset])
+        if self.header.get('block_entries') != BLOCK_ENTRIES:
+            raise BundleError(f"{path} 的块大小与当前版本不一致，请重新打包")
+        self.catalogs = {}
+        for description in self.header['catalogs']:
+            description = dict(description)
+            description['blocks_offset'] += data_offset
+            self.catalogs[(description['locale'], description['name'])] = description
+        self.indexes = {(index['kind'], index['digest'], index['version']): index['attrs']
+                        for index in self.header.get('indexes', ())}
+
+    def catalog(self, name, locale=LOCALE):
+        """返回一个目录，目录包中没有该目录时抛出BundleError"""
+        description = self.catalogs.get((locale, name))
+        if description is None:
+            raise BundleError(f"目录包 {self.path} 中没有 {locale}/{name}")
+        return BundleCatalog(self, description)
+
+    def digest(self, name, locale=LOCALE):
+        """目录原始内容的SHA-256 (与下载缓存中的相同，索引快照可以共用)"""
+        description = self.catalogs.get((locale, name))
+        return description['sha256'] if description else None
+
+    def index(self, kind, digest, version, attrs):
+        """返回{属性名: 查找表视图或值}，目录包中没有对应的索引时返回None"""
+        packed = self.indexes.get((kind, digest, version))
+        if packed is None or set(packed) != set(attrs):
+            return None
+        state = {}
+        for attr, (layout, value) in packed.items():
+            if layout == 'nested':
+                state[attr] = BundleTables({sub: BundleTable(self, offset + self.data_offset)
+                                            for sub, offset in value.items()})
+            elif layout == 'flat':
+                state[attr] = BundleTable(self, value + self.data_offset)
+            else:
+                state[attr] = value
+        return state
+
+def open_bundle(path):
+    """打开目录包，同一路径在进程内只映射一次 (文件被替换后重新映射)"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _bundles_lock:
+        cached = _bundles.get(path)
+        if cached is None or cached[0] != signature:
+            cached = _bundles[path] = (signature, Bundle(path))
+        return cached[1]
+
+def download_catalogs(locales):
+    """并发下载需要打包的所有目录，返回 [(语言, 目录名, 原始JSON字节)]
+
+    可选分类的目录下载失败时跳过，其余目录下载失败时抛出异常。
+    """
+    optional = {config['catalog'] for config in CATEGORIES.values() if config.get('optional')}
+    catalog.prefetch_catalogs(CATALOGS, locales)
+    catalogs = []
+    for locale in locales:
+        for name, timeout in CATALOGS.items():
+            try:
+                catalogs.append((locale, name, catalog.load_catalog_bytes(name, timeout, locale)))
+            except Exception as e:
+                if name not in optional:
+                    raise
+                print(f"! 跳过 {locale}/{name} ({str(e)})")
+    return catalogs
+
+def print_info(path):
+    """显示目录包中的目录"""
+    bundle = open_bundle(path)
+    print(f"目录包: {path} (版本 {BUNDLE_VERSION}, 创建于 {bundle.header.get('created')})")
+    for (locale, name), description in bundle.catalogs.items():
+        print(f"  {locale}/{name:<20} {description['count']:>7} 条  {description['blocks']:>5} 块  "
+              f"sha256 {description['sha256'][:16]}")
+    for kind, digest, version in bundle.indexes:
+        print(f"  索引 {kind:<24} sha256 {digest[:16]}  快照版本 {version}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSGO-API目录打包工具")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="下载目录并打包")
+    build_parser.add_argument("-o", "--output", default="catalogs.bundle", help="输出文件 (默认catalogs.bundle)")
+    build_parser.add_argument("--locales", default=LOCALE, help="打包的语言 (逗号分隔，默认zh-CN)")
+    info_parser = commands.add_parser("info", help="显示目录包内容")
+    info_parser.add_argument("bundle", help="目录包文件")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "info":
+            print_info(args.bundle)
+            return 0
+
+        # 打包时总是从CSGO-API (或下载缓存) 读取目录
+        catalog.BUNDLE_FILE = None
+        locales = [locale.strip() for locale in args.locales.split(",") if locale.strip()]
+        catalogs = download_catalogs(locales)
+        build_bundle(catalogs, args.output, catalog.API_ROOT)
+        print(f"✓ 已打包 {len(catalogs)} 个目录到 {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)")
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"✗ {str(e)}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
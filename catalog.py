@@ -0,0 +1,175 @@
+import os
+import sys
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+import jsonio
+
+# 配置部分
+API_ROOT = os.environ.get("CSGO_API_URL", "https://raw.githubusercontent.com/ByMykel/CSGO-API/main/public/api/")
+LOCALE = "zh-CN"  # 默认语言，其他语言的目录缓存在CACHE_DIR下以语言命名的子目录中
+CACHE_DIR = "translation_cache"
+# 目录包文件 (见bundle.py)，设置后从目录包读取目录，不再下载
+BUNDLE_FILE = os.environ.get("CSGO_API_BUNDLE") or None
+
+_session = None
+_session_lock = threading.Lock()
+_pending = {}  # (语言, 目录名) 到预取任务的映射
+
+def get_session():
+    """返回共享的keep-alive会话 (所有目录共用一个连接池)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            # requests导入较慢，只在真正需要下载时才导入
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+def catalog_url(name, locale=LOCALE):
+    """生成目录数据的下载地址"""
+    return urljoin(API_ROOT, f"{locale}/{name}")
+
+def _cache_paths(name, locale=LOCALE):
+    """返回目录缓存文件和元数据文件路径 (默认语言沿用原来的位置)"""
+    cache_dir = CACHE_DIR if locale == LOCALE else os.path.join(CACHE_DIR, locale)
+    cache_file = os.path.join(cache_dir, name)
+    return cache_file, cache_file + ".meta"
+
+def _display_name(name, locale):
+    """日志中显示的目录名，非默认语言带上语言前缀"""
+    return name if locale == LOCALE else f"{locale}/{name}"
+
+def _read_meta(meta_file):
+    """读取缓存元数据 (ETag/Last-Modified)"""
+    try:
+        return jsonio.load(meta_file)
+    except (OSError, ValueError):
+        return {}
+
+def write_atomic(path, content):
+    """先写临时文件再替换，避免并发运行时读到半个文件"""
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_file, path)
+
+def _open_bundle():
+    # 只有使用目录包时才导入bundle模块
+    from bundle import open_bundle
+    return open_bundle(BUNDLE_FILE)
+
+def catalog_digest(name, locale=LOCALE):
+    """返回已缓存目录内容的SHA-256，用于判断索引快照是否仍然有效"""
+    if BUNDLE_FILE:
+        return _open_bundle().digest(name, locale)
+    cache_file, meta_file = _cache_paths(name, locale)
+    if digest := _read_meta(meta_file).get('sha256'):
+        return digest
+    if not os.path.exists(cache_file):
+        return None
+    with open(cache_file, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def entry_name(entry):
+    """返回目录条目的译名 (驻留字符串)
+
+    翻译只需要条目的name字段，索引中只保存它而不引用整个条目，
+    建立索引后原始目录数据即可释放。
+    """
+    name = entry.get('name')
+    return sys.intern(name) if isinstance(name, str) else ''
+
+def prefetch_catalogs(catalogs, locales=(LOCALE,)):
+    """在线程池中并发下载多个目录
+
+    catalogs为{目录名: 超时秒数}，每个目录下载locales中的所有语言，
+    之后调用load_catalog时直接取预取结果。
+    预取只保存原始字节，到load_catalog时才解析，同一时间只有一个目录处于解析后的状态。
+    """
+    if not catalogs or BUNDLE_FILE:
+        return
+    executor = ThreadPoolExecutor(max_workers=len(catalogs) * len(locales), thread_name_prefix='catalog')
+    for locale in locales:
+        for name, timeout in catalogs.items():
+            _pending[(locale, name)] = executor.submit(_fetch_catalog_bytes, name, timeout, locale)
+    executor.shutdown(wait=False)
+
+def load_catalog(name, timeout=10, locale=LOCALE, restore=None):
+    """加载目录数据，已预取的目录会等待其下载完成
+
+    使用目录包时返回按块解压的BundleCatalog (可迭代，有长度)，不解析整个目录。
+    restore为可选的回调 (通常是从快照恢复索引)，在目录下载或确认未更新之后、解析之前调用，
+    返回True时不再解析目录，直接返回None。
+    """
+    if BUNDLE_FILE:
+        if restore and restore():
+            return None
+        return _open_bundle().catalog(name, locale)
+    content = load_catalog_bytes(name, timeout, locale)
+    if restore and restore():
+        return None
+    return jsonio.loads(content)
+
+def load_catalog_bytes(name, timeout=10, locale=LOCALE):
+    """返回目录的原始JSON字节 (不经过目录包)，已预取的目录会等待其下载完成"""
+    if future := _pending.pop((locale, name), None):
+        return future.result()
+    return _fetch_catalog_bytes(name, timeout, locale)
+
+def _looks_like_json(content):
+    """检查内容是否以[或{开头、以对应的]或}结尾 (可以发现HTML错误页和被截断的下载)"""
+    head = content[:64].lstrip(b' \t\r\n\xef\xbb\xbf')[:1]
+    tail = content[-64:].rstrip(b' \t\r\n')[-1:]
+    return (head, tail) in ((b'[', b']'), (b'{', b'}'))
+
+def _fetch_catalog_bytes(name, timeout, locale=LOCALE):
+    """下载目录数据，返回原始JSON字节
+
+    本地有缓存时发送条件请求 (If-None-Match / If-Modified-Since)，
+    服务器返回304则直接使用缓存；网络不可用时也退回到缓存。
+    """
+    cache_file, meta_file = _cache_paths(name, locale)
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    meta = _read_meta(meta_file) if os.path.exists(cache_file) else {}
+
+    headers = {}
+    if etag := meta.get('etag'):
+        headers['If-None-Match'] = etag
+    if last_modified := meta.get('last_modified'):
+        headers['If-Modified-Since'] = last_modified
+
+    try:
+        response = get_session().get(catalog_url(name, locale), headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            print(f"✓ {_display_name(name, locale)} 未更新，使用缓存")
+            with open(cache_file, 'rb') as f:
+                return f.read()
+
+        response.raise_for_status()
+        content = response.content
+        # 写入缓存前确认内容像一个完整的JSON数组或对象 (只检查首尾字节，完整解析留到load_catalog)
+        if not _looks_like_json(content):
+            raise ValueError("返回的内容不是完整的JSON")
+    except Exception as e:
+        if not os.path.exists(cache_file):
+            raise
+        print(f"! 下载 {_display_name(name, locale)} 失败 ({str(e)})，使用缓存")
+        with open(cache_file, 'rb') as f:
+            return f.read()
+
+    # 保存到缓存
+    write_atomic(cache_file, content)
+    new_meta = {
+        'url': response.url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'sha256': hashlib.sha256(content).hexdigest(),
+    }
+    write_atomic(meta_file, jsonio.dumps(new_meta, compact=False).encode('utf-8'))
+    return content
@@ -0,0 +1,460 @@
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from catalog import LOCALE, entry_name, load_catalog
+from snapshot import restore_index, save_index
+from jsonio import JsonArrayWriter, NotJsonArrayError, read_json_array
+from batch import TranslationMemo, batched
+import fuzzy
+import stats
+
+# 需要保存到索引快照的属性
+INDEX_ATTRS = ('index', 'prefix', 'lookup')
+
+# 按目录ID和名称查找翻译的分类配置:
+#   name        翻译器名称 (用于统计和索引快照)
+#   label       中文名称
+#   catalog     CSGO-API目录名，timeout为下载超时秒数
+#   input       WeaponPaints输入文件名，field为需要翻译的字段
+#   optional    输入文件不存在时跳过该分类而不报错
+#   id_strip    建立ID索引时从目录ID中去除的字符串
+#   id_lookups  依次尝试的ID: (层级名, 添加的前缀, 从输入ID中去除的字符串)
+#   indexes     名称索引: {索引名: (目录字段, 清洗规则)}
+#   name_lookups 依次尝试的名称: (层级名, 索引名, 清洗规则)
+#   fuzzy       精确匹配都失败后近似匹配使用的 (索引名, 清洗规则)，见fuzzy.py
+#               输入为英文名称，近似匹配的索引必须以英文的market_hash_name为键
+#   zh_prefix   从翻译结果中去除的中文前缀 (zh-CN目录)，result_clean为之后的清洗规则
+#               其他语言的目录从名称中自动识别前缀，见 detect_prefix
+#   stattrak_id 输入ID不含该后缀时去除翻译结果中的"StatTrak™ "
+# 清洗规则为 clean_text 的参数: remove依次删除的字符串，cut依次截断的字符，strip是否去除首尾空白
+CATEGORIES = {
+    "stickers": {
+        "name": "StickerTranslator",
+        "label": "印花",
+        "catalog": "stickers.json",
+        "timeout": 15,
+        "input": "stickers.json",
+        "field": "name",
+        "id_strip": "sticker-",
+        "id_lookups": [("id", "", ""), ("id_stripped", "", "sticker-")],
+        "indexes": {
+            "name": ("name", {"remove": ("印花 | ",), "cut": ("<",), "strip": True}),
+            "original_name": ("name", {}),
+            "market_name": ("market_hash_name", {"remove": ("Sticker | ",), "strip": True}),
+        },
+        "name_lookups": [
+            ("original_name", "original_name", {}),
+            ("name_stripped", "name", {"remove": ("Sticker | ",), "strip": True}),
+            ("name_simplest", "name", {"remove": ("Sticker | ",), "cut": ("(", "|"), "strip": True}),
+        ],
+        "fuzzy": ("market_name", {"remove": ("Sticker | ",), "strip": True}),
+        "zh_prefix": "印花 | ",
+        "result_clean": {"cut": ("<",), "strip": True},
+    },
+    "keychains": {
+        "name": "KeychainTranslator",
+        "label": "钥匙扣",
+        "catalog": "keychains.json",
+        "timeout": 10,
+        "input": "keychains.json",
+        "field": "name",
+        "id_strip": "keychain-",
+        "id_lookups": [("id", "", ""), ("id_stripped", "", "keychain-")],
+        "indexes": {
+            "name": ("name", {"remove": ("挂件 | ",)}),
+            "market_name": ("market_hash_name", {"remove": ("Charm | ", "Keychain | "), "strip": True}),
+        },
+        "name_lookups": [
+            ("name", "name", {}),
+            ("name_stripped", "name", {"remove": ("Keychain | ", "Patch | "), "strip": True}),
+        ],
+        "fuzzy": ("market_name", {"remove": ("Charm | ", "Keychain | ", "Patch | "), "strip": True}),
+        "zh_prefix": "挂件 | ",
+    },
+    "music": {
+        "name": "MusicKitTranslator",
+        "label": "音乐盒",
+        "catalog": "music_kits.json",
+        "timeout": 10,
+        "input": "music.json",
+        "field": "name",
+        "id_strip": "_st",
+        "id_lookups": [("id_prefixed", "music_kit-", ""), ("id", "", ""), ("id_stripped", "", "music_kit-")],
+        "indexes": {
+            "name": ("market_hash_name", {"remove": ("StatTrak™ ",)}),
+            "display_name": ("name", {"remove": ("音乐盒 | ", "StatTrak™ ")}),
+        },
+        "name_lookups": [
+            ("name", "name", {}),
+            ("name_stripped", "name", {"remove": ("Music Kit | ",)}),
+            ("artist", "display_name", {"cut": (",",), "strip": True}),
+        ],
+        "fuzzy": ("name", {"remove": ("StatTrak™ ",), "strip": True}),
+        "zh_prefix": "音乐盒 | ",
+        "stattrak_id": "_st",
+    },
+    "patches": {
+        "name": "PatchTranslator",
+        "label": "布章",
+        "catalog": "patches.json",
+        "timeout": 10,
+        "input": "patches.json",
+        "field": "name",
+        "optional": True,
+        "id_strip": "patch-",
+        "id_lookups": [("id", "", ""), ("id_stripped", "", "patch-")],
+        "indexes": {
+            "name": ("name", {"remove": ("布章 | ",), "strip": True}),
+            "market_name": ("market_hash_name", {"remove": ("Patch | ",), "strip": True}),
+        },
+        "name_lookups": [
+            ("name", "name", {}),
+            ("name_stripped", "name", {"remove": ("Patch | ",), "strip": True}),
+        ],
+        "fuzzy": ("market_name", {"remove": ("Patch | ",), "strip": True}),
+        "zh_prefix": "布章 | ",
+    },
+    "graffiti": {
+        "name": "GraffitiTranslator",
+        "label": "涂鸦",
+        "catalog": "graffiti.json",
+        "timeout": 10,
+        "input": "graffiti.json",
+        "field": "name",
+        "optional": True,
+        "id_strip": "graffiti-",
+        "id_lookups": [("id", "", ""), ("id_stripped", "", "graffiti-")],
+        "indexes": {
+            "name": ("name", {"remove": ("封装的涂鸦 | ", "涂鸦 | "), "strip": True}),
+            "market_name": ("market_hash_name", {"remove": ("Sealed Graffiti | ", "Graffiti | "), "strip": True}),
+        },
+        "name_lookups": [
+            ("name", "name", {}),
+            ("name_stripped", "name", {"remove": ("Sealed Graffiti | ", "Graffiti | "), "strip": True}),
+        ],
+        "fuzzy": ("market_name", {"remove": ("Sealed Graffiti | ", "Graffiti | "), "strip": True}),
+        "zh_prefix": "涂鸦 | ",
+    },
+    "collectibles": {
+        "name": "CollectibleTranslator",
+        "label": "收藏品",
+        "catalog": "collectibles.json",
+        "timeout": 10,
+        "input": "collectibles.json",
+        "field": "name",
+        "optional": True,
+        "id_strip": "collectible-",
+        "id_lookups": [("id", "", ""), ("id_stripped", "", "collectible-")],
+        "indexes": {
+            "name": ("name", {"strip": True}),
+            "market_name": ("market_hash_name", {"strip": True}),
+        },
+        "name_lookups": [
+            ("name", "name", {}),
+            ("market_name", "market_name", {}),
+        ],
+        "fuzzy": ("market_name", {"strip": True}),
+    },
+}
+
+def clean_text(text, remove=(), cut=(), strip=False):
+    """按清洗规则处理名称: 删除字符串、在指定字符处截断、去除首尾空白"""
+    for old in remove:
+        text = text.replace(old, '')
+    for char in cut:
+        text = text.split(char)[0]
+    return text.strip() if strip else text
+
+def special_pattern(rules):
+    """匹配清洗规则会改变的文本的正则表达式 (包含要删除的字符串或截断字符，或需要去除首尾空白)
+
+    不匹配的文本经过这些规则清洗后不变，没有任何清洗时返回None。
+    """
+    strings = sorted({text for rule in rules for text in (*rule.get('remove', ()), *rule.get('cut', ())) if text})
+    alternatives = [re.escape(text) for text in strings]
+    if any(rule.get('strip') for rule in rules):
+        alternatives += [r'^\s', r'\s\Z']
+    return re.compile('|'.join(alternatives)) if alternatives else None
+
+def detect_prefix(prefix_counts, total):
+    """从名称前缀的出现次数中找出分类前缀 (如"印花 | ")
+
+    超过一半的条目使用同一个前缀时才认为它是分类前缀，否则返回None。
+    """
+    if not prefix_counts:
+        return None
+    prefix, count = prefix_counts.most_common(1)[0]
+    return f"{prefix} | " if count * 2 > total else None
+
+class CatalogTranslator:
+    """按CATEGORIES中的配置通过ID和名称查找翻译的通用翻译器"""
+
+    def __init__(self, category, locale=LOCALE):
+        self.category = category
+        self.locale = locale  # CSGO-API目录语言
+        self.config = CATEGORIES[category]
+        self.name = self.config['name']
+        self.snapshot_kind = self.name
+        self.label = self.config['label']
+        self.field = self.config['field']
+        self.translations = []
+        self.restored = None  # 是否已从快照恢复索引 (None为还没有尝试)
+        self.index = defaultdict(dict)
+        self.prefix = None  # 从翻译结果中去除的分类前缀
+        # 合并各层级后的查找表: lookup['id']/lookup['name']为输入ID/小写名称到译名的映射，
+        # lookup['id_tier']/lookup['name_tier']记录命中的层级序号 (统计使用)
+        self.lookup = defaultdict(dict)
+        # 输入ID/名称需要清洗时才逐层查找，其余输入只查一次合并后的表
+        self._special = {
+            'id': special_pattern([{'remove': (remove,)} for _, _, remove in self.config['id_lookups']]),
+            'name': special_pattern([rule for _, _, rule in self.config['name_lookups']]),
+        }
+        self._memo = TranslationMemo(self.translate_item, self._lookup_key, self.field, name=self.name)
+        self._fuzzy = fuzzy.FuzzyMatcher()
+
+    def load_translations(self):
+        """加载翻译数据 (目录未变化时直接从快照恢复索引，不解析目录)"""
+        try:
+            self.restored = None
+            self.translations = load_catalog(self.config['catalog'], timeout=self.config['timeout'], locale=self.locale,
+                                             restore=self._restore_index) or []
+            if not self.restored:
+                print(f"✓ 已加载 {len(self.translations)} 条{self.label}翻译数据")
+            return True
+        except Exception as e:
+            print(f"✗ 加载失败: {str(e)}")
+            return False
+
+    def build_index(self):
+        """构建翻译索引"""
+        self._memo.clear()
+        self._fuzzy.clear()
+        # 目录未变化时直接加载上次构建的索引 (通常已在load_translations中恢复)
+        if self.restored or (self.restored is None and self.translations and self._restore_index()):
+            self.translations = []
+            print(f"✓ 已从快照加载{self.label}索引")
+            return True
+        if not self.translations:
+            return False
+
+        id_strip = self.config['id_strip']
+        indexes = [(self.index[index_name], source, rule) for index_name, (source, rule) in self.config['indexes'].items()]
+        id_index = self.index['id']
+        # 中文前缀只适用于zh-CN目录，其他语言统计名称中"前缀 | "的出现次数
+        detect = self.locale != LOCALE and 'zh_prefix' in self.config
+        prefix_counts = Counter()
+        for item in self.translations:
+            if not isinstance(item, dict):
+                continue
+
+            # 索引只保存译名
+            name = entry_name(item)
+            if detect and ' | ' in name:
+                # StatTrak条目 (音乐盒目录中占一半) 的前缀带有"StatTrak™ "，统计时去掉
+                prefix_counts[name.split(' | ', 1)[0].replace('StatTrak™ ', '')] += 1
+
+            # 通过ID索引 (去除前缀/后缀)
+            if item_id := item.get('id', ''):
+                id_index[item_id.replace(id_strip, '')] = name
+
+            # 通过名称索引
+            for index, source, rule in indexes:
+                if text := item.get(source):
+                    index[clean_text(text, **rule).lower()] = name
+
+        self._build_lookup()
+
+        self.prefix = detect_prefix(prefix_counts, len(self.translations)) if detect else self.config.get('zh_prefix')
+        save_index(self, self.config['catalog'], INDEX_ATTRS)
+        # 索引已包含翻译需要的全部数据，释放原始目录
+        self.translations = []
+        sizes = ', '.join(f"{index_name}: {len(index)}" for index_name, index in self.index.items())
+        print(f"✓ 已建立{self.label}索引 ({sizes})")
+        return True
+
+    def _restore_index(self):
+        self.restored = restore_index(self, self.config['catalog'], INDEX_ATTRS)
+        return self.restored
+
+    def translate_item(self, item):
+        """翻译单个项目"""
+        if not isinstance(item, dict):
+            return item
+
+        probe = stats.probe(self.name)
+
+        # 1. 通过ID匹配
+        item_id = str(item.get('id', ''))
+        if item_id and (translation := self._find('id', item_id, probe)) is not None:
+            return self._apply_translation(item, translation)
+
+        # 2. 通过名称匹配
+        item_name = item.get(self.field, '')
+        if item_name:
+            if (translation := self._find('name', item_name, probe)) is not None:
+                return self._apply_translation(item, translation)
+
+            # 3. 近似匹配 (默认关闭)
+            if fuzzy.ENABLED and (fuzzy_lookup := self.config.get('fuzzy')):
+                index_name, rule = fuzzy_lookup
+                if (translation := self._fuzzy.match(self.index, index_name, clean_text(item_name, **rule).lower())) is not None:
+                    probe.hit("fuzzy")
+                    return self._apply_translation(item, translation)
+                probe.miss("fuzzy")
+
+        return item
+
+    def _build_lookup(self):
+        """把各层级的ID和名称查找合并成两张表
+
+        不含需要清洗内容的输入在每个层级查找的键都相同 (ID为原值，名称为小写)，
+        按层级顺序把各层级能命中的输入键写入同一张表，先写入的层级优先，
+        查一次表的结果与逐层查找相同。
+        """
+        id_special = self._special['id']
+        id_table, id_tiers = self.lookup['id'], self.lookup['id_tier']
+        for tier_number, (_, prefix, _) in enumerate(self.config['id_lookups']):
+            for key, name in self.index['id'].items():
+                if not key.startswith(prefix):
+                    continue
+                input_id = key[len(prefix):]
+                if input_id not in id_table and not (id_special and id_special.search(input_id)):
+                    id_table[input_id] = name
+                    id_tiers[input_id] = tier_number
+
+        name_table, name_tiers = self.lookup['name'], self.lookup['name_tier']
+        for tier_number, (_, index_name, _) in enumerate(self.config['name_lookups']):
+            for key, name in self.index[index_name].items():
+                if key not in name_table:
+                    name_table[key] = name
+                    name_tiers[key] = tier_number
+
+    def _find(self, kind, text, probe):
+        """按ID (kind为'id') 或名称 (kind为'name') 查找译名，找不到返回None"""
+        special = self._special[kind]
+        if special and special.search(text):
+            return self._find_by_tiers(kind, text, probe)
+
+        key = text if kind == 'id' else text.lower()
+        translation = self.lookup[kind].get(key)
+        if translation is None:
+            probe.miss(f"{kind}_table")
+        elif stats.ENABLED:
+            tier_number = self.lookup[f"{kind}_tier"][key]
+            probe.hit(self.config[f"{kind}_lookups"][tier_number][0])
+        return translation
+
+    def _find_by_tiers(self, kind, text, probe):
+        """依次尝试配置中的各个层级 (输入需要清洗时使用)"""
+        if kind == 'id':
+            tried = set()  # 跳过重复的ID
+            for tier, prefix, remove in self.config['id_lookups']:
+                search_id = prefix + (text.replace(remove, '') if remove else text)
+                if search_id in tried:
+                    continue
+                tried.add(search_id)
+                if (translation := self.index['id'].get(search_id)) is not None:
+                    probe.hit(tier)
+                    return translation
+                probe.miss(tier)
+            return None
+
+        for tier, index_name, rule in self.config['name_lookups']:
+            if (translation := self.index[index_name].get(clean_text(text, **rule).lower())) is not None:
+                probe.hit(tier)
+                return translation
+            probe.miss(tier)
+        return None
+
+    def _apply_translation(self, item, translated_name):
+        """应用翻译到项目 (translated_name为索引中保存的译名)"""
+        if not translated_name:
+            return item
+
+        # 清洗翻译结果 (去除分类前缀等)
+        if self.prefix and self.prefix in translated_name:
+            translated_name = translated_name.split(self.prefix)[1]
+        if rule := self.config.get('result_clean'):
+            translated_name = clean_text(translated_name, **rule)
+        stattrak_id = self.config.get('stattrak_id')
+        if stattrak_id and 'StatTrak™ ' in translated_name and stattrak_id not in str(item.get('id', '')):
+            translated_name = translated_name.replace('StatTrak™ ', '')
+
+        item[self.field] = translated_name
+        return item
+
+    def _lookup_key(self, item):
+        """translate_item读取的全部字段，相同的行翻译结果相同"""
+        return (str(item.get('id', '')), item.get(self.field, ''))
+
+    def translate_many(self, items):
+        """批量翻译，相同ID和名称的行只解析一次"""
+        return self._memo.translate_many(items)
+
+    def translate_file(self, input_file, stream=False):
+        """翻译整个文件，stream为True时逐条读写，内存占用与文件大小无关"""
+        try:
+            print(f"开始加载输入文件: {input_file}")
+            try:
+                data = read_json_array(input_file, stream)
+            except NotJsonArrayError:
+                print("错误: 输入文件格式不正确，应为JSON数组")
+                return False
+
+            total = len(data) if isinstance(data, list) else None
+            translated = 0
+            count = 0
+
+            print("开始翻译...")
+            os.makedirs('translated', exist_ok=True)
+            output_file = os.path.join('translated', os.path.basename(input_file))
+            with JsonArrayWriter(output_file) as writer:
+                for chunk in batched(data):
+                    original_names = [item.get(self.field, '') if isinstance(item, dict) else None for item in chunk]
+                    for original_name, translated_item in zip(original_names, self.translate_many(chunk)):
+                        count += 1
+                        if not isinstance(translated_item, dict):
+                            writer.write(translated_item)
+                            continue
+
+                        if translated_item.get(self.field, '') != original_name:
+                            translated += 1
+                        writer.write(translated_item)
+
+                        # 每100条显示一次进度
+                        if count % 100 == 0 or count == total:
+                            print(f"\r进度: {count}/{total or '?'} ({translated} 已翻译)", end='')
+
+            print(f"\n✓ 翻译完成! {translated}/{count} 条已翻译")
+            print(f"结果已保存到: {output_file}")
+            return True
+
+        except Exception as e:
+            print(f"\n✗ 文件处理错误: {str(e)}")
+            return False
+
+def main(category):
+    """单独翻译一个分类的输入文件"""
+    translator = CatalogTranslator(category)
+    print(f"=== CSGO{translator.label}翻译工具 ===")
+
+    if not translator.load_translations():
+        return
+
+    if not translator.build_index():
+        return
+
+    input_file = translator.config['input']
+    if not os.path.exists(input_file):
+        print(f"错误: 文件 {input_file} 不存在")
+        return
+
+    print(f"\n开始翻译文件: {input_file}")
+    translator.translate_file(input_file)
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2 or sys.argv[1] not in CATEGORIES:
+        print(f"用法: python catalog_translator.py <分类>  (分类: {', '.join(CATEGORIES)})")
+        sys.exit(1)
+    main(sys.argv[1])
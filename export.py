@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""把翻译结果导出为数据库表 translations (category, key, locale, name)
+
+网站可以按 (分类, 键, 语言) 直接查询一个名称，不必每次加载整个skins.json。
+键: 皮肤/手套为 "weapon_defindex_paint"，探员为model路径，其余分类为物品ID。
+
+导出到SQLite时分批在事务中执行upsert；同时可以生成MySQL可直接导入的SQL文件
+(INSERT ... ON DUPLICATE KEY UPDATE)。
+
+用法: python export.py [--db translations.db] [--sql translations.sql] [--locales zh-CN,zh-TW]
+      (--locales 与 all.py 相同: 不指定时读取translated/，指定时读取translated/<语言>/)
+"""
+import os
+import sys
+import sqlite3
+import argparse
+
+from catalog import LOCALE
+from catalog_translator import CATEGORIES
+from jsonio import read_json_array
+from batch import batched
+
+OUTPUT_DIR = "translated"  # all.py的输出目录
+
+def _skin_key(row):
+    weapon_id = row.get('weapon_defindex')
+    paint_id = row.get('paint')
+    if weapon_id is None or paint_id is None:
+        return None
+    return f"{weapon_id}_{paint_id}"
+
+def _id_key(row):
+    item_id = row.get('id')
+    return None if item_id is None else str(item_id)
+
+# 输出文件: (分类, 取键函数, 名称字段)
+EXPORTS = {
+    "agents.json": ("agents", lambda row: row.get('model'), 'agent_name'),
+    "skins.json": ("skins", _skin_key, 'paint_name'),
+    "gloves.json": ("gloves", _skin_key, 'paint_name'),
+}
+EXPORTS.update({config['input']: (category, _id_key, config['field']) for category, config in CATEGORIES.items()})
+
+# 每个事务/每条INSERT语句包含的行数
+BATCH_SIZE = 1000
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (category, key, locale)
+)
+"""
+
+_MYSQL_SCHEMA = """CREATE TABLE IF NOT EXISTS `translations` (
+  `category` VARCHAR(32) NOT NULL,
+  `key` VARCHAR(255) NOT NULL,
+  `locale` VARCHAR(16) NOT NULL,
+  `name` VARCHAR(512) NOT NULL,
+  PRIMARY KEY (`category`, `key`, `locale`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+
+def export_rows(output_file, category, key_func, field):
+    """逐条读取翻译结果，返回 (分类, 键, 名称) 的迭代器 (跳过没有键或名称的行)"""
+    for row in read_json_array(output_file, stream=True):
+        if not isinstance(row, dict):
+            continue
+        key = key_func(row)
+        name = row.get(field)
+        if key is not None and isinstance(name, str) and name:
+            yield category, str(key), name
+
+class SqliteExporter:
+    """把翻译结果upsert到SQLite数据库 (每批一个事务)"""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute(_SQLITE_SCHEMA)
+
+    def write(self, rows, locale):
+        for chunk in batched(rows, BATCH_SIZE):
+            self.connection.execute("BEGIN")
+            try:
+                self.connection.executemany(
+                    "INSERT INTO translations (category, key, locale, name) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (category, key, locale) DO UPDATE SET name = excluded.name",
+                    [(category, key, locale, name) for category, key, name in chunk])
+                self.connection.execute("COMMIT")
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        self.connection.close()
+
+    def abort(self):
+        # 已提交的批次保留 (upsert可以重复执行)
+        self.connection.close()
+
+def mysql_quote(value):
+    """转义为MySQL字符串常量"""
+    escaped = (value.replace('\\', '\\\\').replace("'", "\\'").replace('\0', '\\0')
+               .replace('\n', '\\n').replace('\r', '\\r').replace('\x1a', '\\Z'))
+    return f"'{escaped}'"
+
+class MysqlDumpWriter:
+    """生成MySQL导入文件，每BATCH_SIZE行一条多值INSERT，整个文件在一个事务中"""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.file = open(self.tmp_path, 'w', encoding='utf-8', newline='\n')
+        self.file.write("-- CS2 WeaponPaints 翻译导出\n")
+        self.file.write("SET NAMES utf8mb4;\n")
+        self.file.write(_MYSQL_SCHEMA)
+        self.file.write("START TRANSACTION;\n")
+
+    def write(self, rows, locale):
+        quoted_locale = mysql_quote(locale)
+        for chunk in batched(rows, BATCH_SIZE):
+            values = ",\n".join(
+                f"({mysql_quote(category)},{mysql_quote(key)},{quoted_locale},{mysql_quote(name)})"
+                for category, key, name in chunk)
+            self.file.write("INSERT INTO `translations` (`category`,`key`,`locale`,`name`) VALUES\n")
+            self.file.write(values)
+            self.file.write("\nON DUPLICATE KEY UPDATE `name` = VALUES(`name`);\n")
+
+    def close(self):
+        self.file.write("COMMIT;\n")
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        # 导出失败时不留下不完整的SQL文件
+        self.file.close()
+        os.remove(self.tmp_path)
+
+def export_translations(output_dirs, input_names, db_file=None, sql_file=None):
+    """导出各语言输出目录中的翻译结果，返回 {语言: 导出行数}
+
+    output_dirs为 [(语言, 输出目录)]，input_names为要导出的输出文件名 (不存在的文件跳过)。
+    """
+    writers = []
+    if db_file:
+        writers.append(SqliteExporter(db_file))
+    if sql_file:
+        writers.append(MysqlDumpWriter(sql_file))
+
+    counts = {}
+    try:
+        for locale, output_dir in output_dirs:
+            counts[locale] = 0
+            for input_name in input_names:
+                output_file = os.path.join(output_dir, input_name)
+                if input_name not in EXPORTS or not os.path.exists(output_file):
+                    continue
+                category, key_func, field = EXPORTS[input_name]
+                # 输出文件只读取一次，每批同时写入所有导出目标
+                for chunk in batched(export_rows(output_file, category, key_func, field), BATCH_SIZE):
+                    for writer in writers:
+                        writer.write(chunk, locale)
+                    counts[locale] += len(chunk)
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+    for writer in writers:
+        writer.close()
+    return counts
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="把翻译结果导出为数据库表")
+    parser.add_argument("--db", help="upsert到SQLite数据库文件")
+    parser.add_argument("--sql", help="生成MySQL导入文件")
+    parser.add_argument("--locales", help="导出的语言 (逗号分隔，与all.py --locales相同)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.db and not args.sql:
+        print("错误: 至少需要指定 --db 或 --sql")
+        return 2
+
+    if args.locales:
+        locales = [locale.strip() for locale in args.locales.split(",") if locale.strip()]
+        output_dirs = [(locale, os.path.join(OUTPUT_DIR, locale)) for locale in locales]
+    else:
+        output_dirs = [(LOCALE, OUTPUT_DIR)]
+
+    try:
+        counts = export_translations(output_dirs, list(EXPORTS), args.db, args.sql)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"✗ 导出失败: {str(e)}")
+        return 1
+    for locale, count in counts.items():
+        print(f"✓ {locale}: 已导出 {count} 条翻译")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
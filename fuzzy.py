@@ -0,0 +1,120 @@
+import re
+import heapq
+import math
+from collections import defaultdict
+
+# 是否在所有精确匹配都失败后尝试近似匹配 (默认关闭)
+ENABLED = False
+# 相似度阈值 (三元组Dice系数，0~1)，低于阈值的候选不采用
+THRESHOLD = 0.8
+# 出现在超过该比例 (且至少COMMON_MIN个) 名称中的三元组视为常见三元组，不用来产生候选
+COMMON_FRACTION = 0.02
+COMMON_MIN = 200
+
+# 名称中的数字 (年份、编号、"2号"等) 区分的是不同的物品，数字不同的候选不采用
+_NUMBER = re.compile(r'[0-9]+')
+
+def enable(enabled=True, threshold=None):
+    """开启或关闭近似匹配，threshold为None时保持当前阈值"""
+    global ENABLED, THRESHOLD
+    ENABLED = bool(enabled)
+    if threshold is not None:
+        THRESHOLD = float(threshold)
+
+def normalize(text):
+    """近似匹配前的统一处理: 小写、合并连续空白"""
+    return ' '.join(str(text).lower().split())
+
+def trigrams(text):
+    """文本的三元组集合 (首尾补空格，短文本也至少有一个三元组)"""
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+class TrigramIndex:
+    """名称的三元组倒排索引
+
+    查询时按前缀过滤只从最少见的几个三元组中取候选，再对候选精确计算相似度，
+    不需要与所有名称逐一比较。名称中的数字与查询不同的候选 (如Agent21与Agent1) 不采用。
+    """
+
+    def __init__(self, keys):
+        self.keys = []
+        self.grams = []
+        self.numbers = []
+        postings = defaultdict(list)
+        for key in keys:
+            normalized = normalize(key)
+            if not normalized:
+                continue
+            grams = trigrams(normalized)
+            key_id = len(self.keys)
+            self.keys.append(key)
+            self.grams.append(grams)
+            self.numbers.append(_NUMBER.findall(normalized))
+            for gram in grams:
+                postings[gram].append(key_id)
+        self.postings = dict(postings)
+
+    def search(self, text, threshold=None, limit=5):
+        """返回相似度不低于阈值的候选 [(相似度, 键)]，按相似度从高到低排序"""
+        if threshold is None:
+            threshold = THRESHOLD
+        normalized = normalize(text)
+        query = trigrams(normalized)
+        numbers = _NUMBER.findall(normalized)
+        size = len(query)
+
+        # 相似度达到阈值时至少要有min_overlap个相同的三元组，
+        # 所以候选必然出现在最少见的 size - min_overlap + 1 个三元组的倒排表中 (前缀过滤)。
+        # 超过COMMON_FRACTION的名称都包含的三元组 (如"sticker | ") 不再用来产生候选，
+        # 只靠这类三元组才达到阈值的名称会被漏掉，但查询量不再随目录大小增长
+        min_overlap = max(1, math.ceil(threshold * size / (2 - threshold)))
+        postings = sorted((self.postings.get(gram, ()) for gram in query), key=len)
+        common = max(COMMON_MIN, len(self.keys) * COMMON_FRACTION)
+        candidates = set()
+        for posting in postings[:size - min_overlap + 1]:
+            if candidates and len(posting) > common:
+                break
+            candidates.update(posting)
+
+        results = []
+        for key_id in candidates:
+            if self.numbers[key_id] != numbers:
+                continue
+            grams = self.grams[key_id]
+            score = 2 * len(query & grams) / (size + len(grams))
+            if score >= threshold:
+                results.append((score, self.keys[key_id]))
+        return heapq.nsmallest(limit, results, key=lambda result: (-result[0], str(result[1])))
+
+class FuzzyMatcher:
+    """翻译器的近似匹配层: 对名称索引按需建立三元组索引
+
+    三元组索引在第一次未命中时才建立，没有未命中的运行不产生额外开销。
+    索引重建后需要调用clear。
+    """
+
+    def __init__(self):
+        self._indexes = {}  # 索引名到TrigramIndex的映射
+
+    def clear(self):
+        self._indexes.clear()
+
+    def match(self, index, index_name, text):
+        """在index[index_name]中近似查找text，返回译名
+
+        最相似的候选不唯一 (相似度相同但译名不同) 时不采用，返回None。
+        """
+        table = index[index_name]
+        trigram_index = self._indexes.get(index_name)
+        if trigram_index is None:
+            trigram_index = self._indexes[index_name] = TrigramIndex(table.keys())
+
+        candidates = trigram_index.search(text, limit=2)
+        if not candidates:
+            return None
+        best_score, best_key = candidates[0]
+        translation = table.get(best_key)
+        if len(candidates) > 1 and candidates[1][0] == best_score and table.get(candidates[1][1]) != translation:
+            return None
+        return translation
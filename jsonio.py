@@ -0,0 +1,240 @@
+import json
+import math
+import os
+import re
+
+# 可选的高速JSON库，未安装时使用标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 流式读取时每次读入的字符数
+CHUNK_SIZE = 1 << 16
+
+# JSON后端: 设置环境变量 JSON_BACKEND=json 可强制使用标准库
+BACKEND = os.environ.get("JSON_BACKEND") or ("orjson" if orjson else "json")
+if BACKEND == "orjson" and orjson is None:
+    BACKEND = "json"
+
+# 紧凑输出 (无缩进和空格)，适合生产环境
+COMPACT = False
+
+# orjson与标准库写法不同的浮点数: 标准库对绝对值小于1e-4或不小于1e16的数使用指数形式
+# (1e-05、1e+16)，orjson写成0.00001、1e16；NaN和Infinity被orjson写成null。
+# orjson的输出中出现指数或0.0000时 (也可能出现在字符串里，退回标准库只是慢一些) 退回标准库
+_ORJSON_EXPONENT = re.compile(r'e[-0-9]')
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+class NotJsonArrayError(ValueError):
+    """输入文件不是JSON数组"""
+
+def set_compact(compact):
+    """切换紧凑输出模式"""
+    global COMPACT
+    COMPACT = bool(compact)
+
+def loads(data):
+    """解析JSON文本 (str或bytes)"""
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _has_nonfinite(obj):
+    """obj中是否有NaN或Infinity"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+def dumps(obj, compact=None, default=None):
+    """序列化为JSON文本
+
+    默认输出与 json.dumps(obj, ensure_ascii=False, indent=2) 相同，
+    紧凑模式与 separators=(',', ':') 相同。orjson不支持的对象 (如非字符串键、
+    超出64位的整数) 以及写法与标准库不同的浮点数 (见_ORJSON_EXPONENT) 自动退回标准库。
+    default与json.dumps的同名参数相同，用于转换不能序列化的对象。
+    """
+    if compact is None:
+        compact = COMPACT
+    if BACKEND == "orjson":
+        try:
+            text = orjson.dumps(obj, default=default, option=0 if compact else orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:
+            pass
+        else:
+            if ('0.0000' not in text and not _ORJSON_EXPONENT.search(text)
+                    and not ('null' in text and _has_nonfinite(obj))):
+                return text
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=default)
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=default)
+
+def load(path):
+    """读取JSON文件"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def dump(obj, path, compact=None):
+    """写入JSON文件 (先写临时文件再替换)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(dumps(obj, compact))
+    os.replace(tmp_path, path)
+
+class _ArrayReader:
+    """逐个解析JSON数组元素，只在内存中保留当前元素附近的文本"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+        if self._next_char() != '[':
+            raise NotJsonArrayError("输入文件格式不正确，应为JSON数组")
+        self.pos += 1
+
+    def _fill(self):
+        """读入下一块文本，返回是否读到了新内容"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # 丢弃已经解析过的部分，保持内存占用恒定
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _next_char(self):
+        """跳过空白并返回下一个字符 (不消耗)，文件结束时返回空串"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def _decode_value(self):
+        """解析一个完整的值，文本不足时继续读入"""
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # 数字可能恰好被块边界截断 (如 "12." 后面还有 "5")，
+                # 只有看到分隔符才能确认值已经完整
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in _DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def items(self):
+        """依次产出数组元素"""
+        try:
+            if self._next_char() == ']':
+                self.pos += 1
+                return
+            while True:
+                self._next_char()
+                yield self._decode_value()
+
+                char = self._next_char()
+                if char == ',':
+                    self.pos += 1
+                elif char == ']':
+                    self.pos += 1
+                    return
+                else:
+                    raise ValueError(f"JSON数组格式错误: 元素后应为 ',' 或 ']'，实际为 {char!r}")
+        finally:
+            self.f.close()
+
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    """流式读取JSON数组文件，返回逐个产出元素的迭代器
+
+    文件不是JSON数组时立即抛出NotJsonArrayError。
+    """
+    f = open(path, 'r', encoding='utf-8')
+    try:
+        reader = _ArrayReader(f, chunk_size)
+    except BaseException:
+        f.close()
+        raise
+    return reader.items()
+
+class JsonArrayWriter:
+    """逐个写出数组元素
+
+    输出与 dump(data, path) 整体写出的结果逐字节一致。
+    先写入临时文件，关闭时再替换目标文件。
+    """
+
+    def __init__(self, path, compact=None):
+        self.path = path
+        self.compact = COMPACT if compact is None else compact
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.f = open(self.tmp_path, 'w', encoding='utf-8')
+        self.count = 0
+
+    def write(self, item):
+        """写出一个数组元素"""
+        text = dumps(item, self.compact)
+        if self.compact:
+            self.f.write(('[' if self.count == 0 else ',') + text)
+        else:
+            # JSON字符串中的换行都已转义，可以安全地按行缩进
+            self.f.write(('[\n  ' if self.count == 0 else ',\n  ') + text.replace('\n', '\n  '))
+        self.count += 1
+
+    def close(self):
+        """结束数组并替换目标文件"""
+        if self.compact:
+            self.f.write(']' if self.count else '[]')
+        else:
+            self.f.write('\n]' if self.count else '[]')
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """放弃写入，保留原有的目标文件"""
+        self.f.close()
+        os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+def read_json_array(path, stream=False):
+    """读取JSON数组文件
+
+    stream为True时返回逐个解析元素的迭代器，否则返回完整列表；
+    文件不是JSON数组时抛出NotJsonArrayError。
+    """
+    if stream:
+        return iter_json_array(path)
+    data = load(path)
+    if not isinstance(data, list):
+        raise NotJsonArrayError("输入文件格式不正确，应为JSON数组")
+    return data
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import jsonio
+import fuzzy
+from catalog import CACHE_DIR, LOCALE, catalog_digest
+
+# 清单格式版本，翻译逻辑变化时递增以使旧清单失效
+MANIFEST_VERSION = 1
+MANIFEST_DIR = os.path.join(CACHE_DIR, "manifest")
+
+def row_key(item):
+    """计算一行输入内容的哈希 (与键顺序无关)"""
+    text = json.dumps(item, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+class RowManifest:
+    """记录每行输入的内容哈希和翻译结果
+
+    下次运行时内容未变的行直接复用上次的结果，只有新增或变化的行才重新翻译。
+    目录数据更新后清单整体失效。每种语言有各自的清单。
+    """
+
+    def __init__(self, input_file, catalog_name, field, locale=LOCALE):
+        self.field = field
+        self.catalog = catalog_digest(catalog_name, locale)
+        path_hash = hashlib.sha1(os.path.abspath(input_file).encode('utf-8')).hexdigest()[:8]
+        suffix = "" if locale == LOCALE else f"-{locale}"
+        self.manifest_file = os.path.join(MANIFEST_DIR, f"{os.path.basename(input_file)}-{path_hash}{suffix}.json")
+        # 近似匹配的设置会影响翻译结果，设置变化后清单失效
+        self.fuzzy = fuzzy.THRESHOLD if fuzzy.ENABLED else None
+        self.previous = self._load()
+        self.rows = {}
+        self.reused = 0
+        self.translated = 0
+
+    def _load(self):
+        """读取上次的清单，版本或目录不一致时返回空表"""
+        try:
+            manifest = jsonio.load(self.manifest_file)
+        except (OSError, ValueError):
+            return {}
+        if (manifest.get('version') != MANIFEST_VERSION
+                or manifest.get('catalog') != self.catalog
+                or manifest.get('field') != self.field
+                or manifest.get('fuzzy') != self.fuzzy):
+            return {}
+        return manifest.get('rows', {})
+
+    def translate_many(self, items, translate_many, keys=None):
+        """批量翻译，内容未变的行直接使用上次的结果，其余行交给translate_many
+
+        keys为预先计算的行哈希 (多种语言翻译同一批行时共用)，默认逐行计算。
+        """
+        if keys is None:
+            keys = [row_key(item) for item in items]
+        results = [None] * len(items)
+        pending = []  # (位置, 行哈希)
+        for i, (item, key) in enumerate(zip(items, keys)):
+            if key in self.previous:
+                translated_item = dict(item)
+                translated_item[self.field] = self.previous[key]
+                self.rows[key] = self.previous[key]
+                results[i] = translated_item
+            else:
+                pending.append((i, key))
+        self.reused += len(items) - len(pending)
+
+        if pending:
+            translated_items = translate_many([items[i] for i, _ in pending])
+            for (i, key), translated_item in zip(pending, translated_items):
+                if self.field in translated_item:
+                    self.rows[key] = translated_item[self.field]
+                results[i] = translated_item
+            self.translated += len(pending)
+        return results
+
+    def save(self):
+        """保存本次的清单 (只保留本次输入中出现的行)"""
+        if not self.catalog:
+            return
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'catalog': self.catalog,
+            'field': self.field,
+            'fuzzy': self.fuzzy,
+            'rows': self.rows,
+        }
+        os.makedirs(MANIFEST_DIR, exist_ok=True)
+        jsonio.dump(manifest, self.manifest_file, compact=True)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""翻译结果的增量补丁
+
+all.py --patch 在写出每个输出文件的同时与上次的输出逐行比较，把变化写成补丁文件
+patches/<输出文件>.patch.json；只需要把补丁同步到网站服务器，再用本工具应用到
+已部署的文件上，同步的数据量与变化的名称数量成正比。
+
+补丁格式 (JSON对象):
+  version    补丁格式版本
+  file       输出文件相对于输出目录的路径 (如 skins.json、zh-TW/skins.json)
+  field      翻译的字段名，compact为输出是否为紧凑JSON
+  base_rows  上次输出的行数 (没有上次的输出时为null)，rows为新的行数
+  base_digest 上次输出的SHA-256 (没有上次的输出时为null)，digest为新输出的SHA-256
+             (见file_digest，换行统一为\n后计算)
+  changes    只有翻译字段变化的行: [行号, 键, 旧值, 新值]，键见export.py (仅供查看)
+  replace    其他变化的行 (新增的行或其他字段也变化的行): [行号, 新行]
+应用前核对已部署文件的摘要: 与digest相同说明已经是最新，与base_digest不同时拒绝应用
+(例如漏掉了之前的补丁，需要同步完整文件)。
+
+用法: python patch.py apply [--patches patches] [--target translated]
+"""
+import os
+import sys
+import hashlib
+import argparse
+
+import jsonio
+from catalog import write_atomic
+from jsonio import JsonArrayWriter, NotJsonArrayError, iter_json_array, read_json_array
+
+# 补丁格式版本
+PATCH_VERSION = 2
+PATCH_SUFFIX = ".patch.json"
+# 计算摘要时每次读入的字节数
+DIGEST_CHUNK = 1 << 20
+
+class PatchError(ValueError):
+    """补丁无法应用到目标文件"""
+
+def file_digest(path):
+    """文件内容的SHA-256，文件不存在时返回None
+
+    计算前把\r\n统一为\n (JSON字符串中的换行都已转义，只有缩进的换行会受影响)，
+    在不同系统上写出的相同内容摘要相同。
+    """
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    pending = b''
+    with open(path, 'rb') as f:
+        while chunk := f.read(DIGEST_CHUNK):
+            chunk = pending + chunk
+            # \r\n可能被块边界分开
+            pending = b'\r' if chunk.endswith(b'\r') else b''
+            digest.update(chunk[:len(chunk) - len(pending)].replace(b'\r\n', b'\n'))
+    digest.update(pending)
+    return digest.hexdigest()
+
+def _row_key(key_func, row):
+    if key_func is None or not isinstance(row, dict):
+        return None
+    try:
+        return key_func(row)
+    except Exception:
+        return None
+
+class PatchWriter:
+    """在写出新输出的同时与旧输出逐行比较
+
+    旧输出在创建时打开并逐行流式读取，必须在新输出替换旧文件之前关闭
+    (在ExitStack中晚于JsonArrayWriter进入)；新输出写完后调用save写出补丁。
+    """
+
+    def __init__(self, output_file, patch_file, relative_path, field, key_func=None, compact=None):
+        self.output_file = output_file
+        self.patch_file = patch_file
+        self.field = field
+        self.key_func = key_func
+        self.patch = {
+            "version": PATCH_VERSION,
+            "file": relative_path.replace(os.sep, '/'),
+            "field": field,
+            "compact": jsonio.COMPACT if compact is None else bool(compact),
+            "base_rows": None,
+            "rows": 0,
+            "base_digest": None,
+            "digest": None,
+            "changes": [],
+            "replace": [],
+        }
+        self._old_rows = None
+        self._has_base = False
+        self._base_rows = 0
+        if os.path.exists(output_file):
+            try:
+                self._old_rows = iter_json_array(output_file)
+                self._has_base = True
+                self.patch['base_digest'] = file_digest(output_file)
+            except (NotJsonArrayError, ValueError):
+                # 上次的输出不可用，补丁包含所有行
+                self._old_rows = None
+
+    @property
+    def changed(self):
+        """变化的行数 (包括删除的行)"""
+        removed = max(0, (self.patch['base_rows'] or 0) - self.patch['rows'])
+        return len(self.patch['changes']) + len(self.patch['replace']) + removed
+
+    def _next_old(self):
+        if self._old_rows is None:
+            return None, False
+        try:
+            row = next(self._old_rows)
+        except StopIteration:
+            self._old_rows = None
+            return None, False
+        self._base_rows += 1
+        return row, True
+
+    def add(self, row):
+        """比较新输出的下一行"""
+        index = self.patch['rows']
+        self.patch['rows'] += 1
+        old, found = self._next_old()
+        if found and old == row:
+            return
+        field = self.field
+        if (found and isinstance(old, dict) and isinstance(row, dict) and field in old and field in row
+                and dict(old, **{field: row[field]}) == row):
+            self.patch['changes'].append([index, _row_key(self.key_func, row), old[field], row[field]])
+        else:
+            self.patch['replace'].append([index, row])
+
+    def close(self):
+        """读完并关闭旧输出"""
+        while self._next_old()[1]:
+            pass
+        if self._has_base:
+            self.patch['base_rows'] = self._base_rows
+
+    def save(self):
+        """新输出替换旧文件之后写出补丁文件"""
+        self.patch['digest'] = file_digest(self.output_file)
+        os.makedirs(os.path.dirname(self.patch_file) or '.', exist_ok=True)
+        write_atomic(self.patch_file, jsonio.dumps(self.patch, compact=True).encode('utf-8'))
+
+    def abort(self):
+        if self._old_rows is not None:
+            self._old_rows.close()
+            self._old_rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+def apply_patch(patch, target_file):
+    """把补丁应用到target_file，返回 (修改的行数, 是否重写了文件)
+
+    已经是最新时返回 (0, False)，不重写文件；没有行变化但输出格式变化 (如切换--compact) 时
+    按补丁的格式重写。target_file的摘要与补丁的基准不一致、或应用后与补丁的摘要不一致时
+    抛出PatchError。
+    """
+    if patch.get('version') != PATCH_VERSION:
+        raise PatchError(f"补丁格式版本为 {patch.get('version')}，当前只支持版本 {PATCH_VERSION}")
+
+    digest = file_digest(target_file)
+    if digest == patch['digest']:
+        return 0, False
+    if digest != patch['base_digest']:
+        if digest is None:
+            raise PatchError(f"找不到 {target_file}")
+        raise PatchError(f"{target_file} 与补丁的基准不一致 (可能漏掉了之前的补丁)，需要同步完整文件")
+
+    base_rows, rows, field = patch['base_rows'], patch['rows'], patch['field']
+    data = read_json_array(target_file) if digest is not None else []
+    if len(data) != (base_rows or 0):
+        raise PatchError(f"{target_file} 有 {len(data)} 行，与补丁的基准 ({base_rows} 行) 不一致")
+
+    changed = 0
+    for index, _, old, new in patch['changes']:
+        row = data[index] if index < len(data) else None
+        current = row.get(field) if isinstance(row, dict) else None
+        if row is None or current != old:
+            raise PatchError(f"{target_file} 第 {index} 行的 {field} 为 {current!r}，与补丁的旧值 {old!r} 不一致")
+        row[field] = new
+        changed += 1
+
+    for index, row in patch['replace']:
+        if index < len(data):
+            data[index] = row
+            changed += 1
+        elif index == len(data):
+            data.append(row)
+            changed += 1
+        else:
+            raise PatchError(f"补丁第 {index} 行超出 {target_file} 的范围")
+
+    if len(data) > rows:
+        del data[rows:]
+        changed += 1
+    if len(data) != rows:
+        raise PatchError(f"应用补丁后 {target_file} 有 {len(data)} 行，应为 {rows} 行")
+
+    # 没有行变化时也可能需要重写: 输出格式变化后内容相同但字节不同
+    with JsonArrayWriter(target_file, compact=patch.get('compact')) as writer:
+        for row in data:
+            writer.write(row)
+    if file_digest(target_file) != patch['digest']:
+        raise PatchError(f"应用补丁后 {target_file} 与补丁的摘要不一致，需要同步完整文件")
+    return changed, True
+
+def find_patches(patch_dir):
+    """返回补丁目录中的所有补丁文件 (按路径排序)"""
+    patch_files = []
+    for root, _, names in os.walk(patch_dir):
+        patch_files.extend(os.path.join(root, name) for name in names if name.endswith(PATCH_SUFFIX))
+    return sorted(patch_files)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="翻译结果补丁工具")
+    commands = parser.add_subparsers(dest="command", required=True)
+    apply_parser = commands.add_parser("apply", help="把补丁应用到已部署的输出文件")
+    apply_parser.add_argument("--patches", default="patches", help="补丁目录 (默认patches)")
+    apply_parser.add_argument("--target", default="translated", help="已部署的输出目录 (默认translated)")
+    args = parser.parse_args(argv)
+
+    patch_files = find_patches(args.patches)
+    if not patch_files:
+        print(f"! {args.patches} 中没有补丁")
+        return 0
+
+    failed = 0
+    for patch_file in patch_files:
+        try:
+            patch = jsonio.load(patch_file)
+            target_file = os.path.join(args.target, *patch['file'].split('/'))
+            changed, rewritten = apply_patch(patch, target_file)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"✗ {patch_file}: {str(e)}")
+            failed += 1
+            continue
+        if changed:
+            status = f"修改 {changed} 行"
+        else:
+            status = "已按新的输出格式重写" if rewritten else "已是最新"
+        print(f"✓ {patch['file']}: {status}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
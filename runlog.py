@@ -0,0 +1,124 @@
+import os
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+import jsonio
+
+# 是否在事件文件中记录逐条的调试事件 (如每个未翻译的物品)，默认关闭
+DEBUG = False
+
+_logs = {}  # 日志文件到RunLog的映射
+_lock = threading.Lock()
+
+def set_debug(enabled=True):
+    """开启或关闭调试事件"""
+    global DEBUG
+    DEBUG = bool(enabled)
+
+def events_file(log_file):
+    """日志文件对应的事件文件: translation_log_*.txt -> translation_log_*.events.jsonl"""
+    return os.path.splitext(log_file)[0] + ".events.jsonl"
+
+class _TextFormatter(logging.Formatter):
+    """日志文本在调用处已经带上时间，原样写出"""
+
+    def format(self, record):
+        return record.getMessage()
+
+class _EventFormatter(logging.Formatter):
+    """事件写成一行JSON: {"time": 时间戳, "event": 事件名, ...字段}"""
+
+    def format(self, record):
+        if record.raw:
+            return record.getMessage()
+        return jsonio.dumps({"time": round(record.created, 3), "event": record.event, **record.fields},
+                            compact=True, default=str)
+
+class _KindFilter(logging.Filter):
+    """按记录类型 (文本或事件) 分发到对应的文件"""
+
+    def __init__(self, kind):
+        super().__init__()
+        self.kind = kind
+
+    def filter(self, record):
+        return record.kind == self.kind
+
+class _QueueHandler(QueueHandler):
+    """记录已经是最终内容，放入队列前不再格式化"""
+
+    def prepare(self, record):
+        return record
+
+class RunLog:
+    """一个日志文件的后台写入器
+
+    write/event只把记录放入队列，由QueueListener在后台线程写入日志文件和事件文件，
+    两个文件各只打开一次，写日志不会阻塞翻译。
+    """
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+        self.events_file = events_file(log_file)
+        text_handler = logging.FileHandler(log_file, encoding="utf-8", delay=True)
+        text_handler.setFormatter(_TextFormatter())
+        text_handler.addFilter(_KindFilter("text"))
+        event_handler = logging.FileHandler(self.events_file, encoding="utf-8", delay=True)
+        event_handler.setFormatter(_EventFormatter())
+        event_handler.addFilter(_KindFilter("event"))
+
+        self._queue = queue.SimpleQueue()
+        self._listener = QueueListener(self._queue, text_handler, event_handler)
+        self._handlers = (text_handler, event_handler)
+        self._logger = logging.Logger(f"runlog:{log_file}", logging.DEBUG)
+        self._logger.addHandler(_QueueHandler(self._queue))
+        self._listener.start()
+
+    def _put(self, kind, message, level=logging.INFO, **attrs):
+        self._logger.log(level, message, extra={"kind": kind, "raw": False, **attrs})
+
+    def write(self, line):
+        """写入一行日志文本"""
+        self._put("text", line)
+
+    def event(self, name, /, **fields):
+        """写入一个事件"""
+        self._put("event", name, event=name, fields=fields)
+
+    def debug(self, name, /, **fields):
+        """写入一个调试事件 (DEBUG为False时忽略)"""
+        if DEBUG:
+            self._put("event", name, logging.DEBUG, event=name, fields=fields)
+
+    def append(self, text, events=""):
+        """原样追加其他日志的内容 (并行翻译时子进程的日志和事件)"""
+        if text:
+            self._put("text", text.rstrip("\n"))
+        if events:
+            self._logger.info(events.rstrip("\n"), extra={"kind": "event", "raw": True})
+
+    def close(self):
+        """等待队列中的记录全部写出后关闭文件"""
+        self._listener.stop()
+        for handler in self._handlers:
+            handler.close()
+
+def get(log_file):
+    """返回日志文件的RunLog，同一文件在进程内只创建一次"""
+    with _lock:
+        run_log = _logs.get(log_file)
+        if run_log is None:
+            run_log = _logs[log_file] = RunLog(log_file)
+        return run_log
+
+def close(log_file=None):
+    """写出并关闭指定日志文件 (默认所有日志文件)，之后再写入时重新打开"""
+    with _lock:
+        names = [log_file] if log_file is not None else list(_logs)
+        run_logs = [_logs.pop(name) for name in names if name in _logs]
+    for run_log in run_logs:
+        run_log.close()
+
+atexit.register(close)
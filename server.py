@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""常驻翻译服务
+
+启动时加载所有目录并建立索引，之后通过HTTP接口翻译少量数据，不必每次运行all.py。
+
+接口:
+  POST /translate/<分类>  请求体为JSON数组，返回翻译后的数组
+                          分类: agents, skins, gloves 以及catalog_translator中配置的分类
+                          (stickers, keychains, music, patches, graffiti, collectibles)
+  POST /reload            重新加载目录 (目录未更新时只发送条件请求)
+  GET  /health            返回各分类是否可用
+
+用法: python server.py [--host 127.0.0.1] [--port 8080]
+"""
+import sys
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agents import AgentTranslator
+from skins import SkinGloveTranslator
+from catalog_translator import CATEGORIES as CATALOG_CATEGORIES, CatalogTranslator
+import catalog
+import snapshot
+import batch
+from sqlite_index import SnapshotMissingError
+from catalog import prefetch_catalogs
+import jsonio
+
+# 分类: (翻译器类, 构造参数, 目录名, 超时秒数, translate_many的额外参数)
+# 使用同一目录的分类共用一个翻译器实例 (皮肤和手套)
+CATEGORIES = {
+    "agents": (AgentTranslator, (), "agents.json", 10, {}),
+    "skins": (SkinGloveTranslator, (), "skins.json", 30, {"is_glove": False}),
+    "gloves": (SkinGloveTranslator, (), "skins.json", 30, {"is_glove": True}),
+}
+CATEGORIES.update({
+    category: (CatalogTranslator, (category,), config['catalog'], config['timeout'], {})
+    for category, config in CATALOG_CATEGORIES.items()
+})
+
+# 请求体大小上限 (字节)
+MAX_BODY_SIZE = 64 * 1024 * 1024
+# 每个翻译器最多缓存的查找键数 (见batch.MEMO_SIZE)，服务长时间运行时缓存不会无限增长
+MEMO_SIZE = 100_000
+
+class TranslationService:
+    """持有所有已建立索引的翻译器"""
+
+    def __init__(self):
+        self.translators = {}  # 分类到翻译器实例的映射
+        self._reload_lock = threading.Lock()
+
+    def load(self):
+        """加载目录并建立索引，返回加载成功的分类列表
+
+        新的翻译器全部就绪后才替换旧的，重新加载期间请求仍由旧索引处理。
+        """
+        with self._reload_lock:
+            prefetch_catalogs({catalog_name: timeout for _, _, catalog_name, timeout, _ in CATEGORIES.values()})
+
+            instances = {}  # 目录名到翻译器实例的映射 (加载失败为None)
+            translators = {}
+            for category, (translator_class, args, catalog_name, _, _) in CATEGORIES.items():
+                if catalog_name not in instances:
+                    translator = translator_class(*args)
+                    if translator.load_translations():
+                        translator.build_index()
+                        instances[catalog_name] = translator
+                    else:
+                        instances[catalog_name] = None
+                if instances[catalog_name] is not None:
+                    translators[category] = instances[catalog_name]
+
+            self.translators = translators
+            return list(translators)
+
+    def translate(self, category, rows):
+        """翻译一个分类的数据行
+
+        使用索引数据库时，索引可能已被其他进程删除 (目录更新后长时间没有使用)，
+        这时重新加载索引后再翻译一次。
+        """
+        translator = self.translators[category]
+        try:
+            return translator.translate_many(rows, **CATEGORIES[category][4])
+        except SnapshotMissingError as e:
+            print(f"! {str(e)}")
+            self.load()
+            if category not in self.translators:
+                raise
+            return self.translators[category].translate_many(rows, **CATEGORIES[category][4])
+
+class TranslationHandler(BaseHTTPRequestHandler):
+    """处理翻译服务的HTTP请求"""
+
+    server_version = "CS2Translate/1.0"
+
+    def _send_json(self, status, obj):
+        body = jsonio.dumps(obj, compact=True).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {"error": message})
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path.rstrip('/') == '/health':
+            self._send_json(200, {category: category in service.translators for category in CATEGORIES})
+        else:
+            self._send_error(404, f"未知路径: {self.path}")
+
+    def do_POST(self):
+        service = self.server.service
+        path = self.path.split('?')[0].rstrip('/')
+
+        if path == '/reload':
+            loaded = service.load()
+            self._send_json(200, {"loaded": loaded})
+            return
+
+        prefix, _, category = path.rpartition('/')
+        if prefix != '/translate' or category not in CATEGORIES:
+            self._send_error(404, f"未知路径: {self.path}")
+            return
+        if category not in service.translators:
+            self._send_error(503, f"{category} 翻译数据加载失败，暂不可用")
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_SIZE:
+            self._send_error(413 if length > 0 else 400, "请求体长度无效")
+            return
+
+        try:
+            rows = jsonio.loads(self.rfile.read(length))
+        except ValueError as e:
+            self._send_error(400, f"JSON解析失败: {str(e)}")
+            return
+        if not isinstance(rows, list):
+            self._send_error(400, "请求体应为JSON数组")
+            return
+
+        try:
+            result = service.translate(category, rows)
+        except Exception as e:
+            self._send_error(500, f"翻译失败: {str(e)}")
+            return
+        self._send_json(200, result)
+
+    def log_message(self, format, *args):
+        # 只记录错误请求，避免每次翻译都刷屏
+        if len(args) > 1 and str(args[1]).startswith(('4', '5')):
+            super().log_message(format, *args)
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="CS2 物品常驻翻译服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址 (默认只允许本机访问)")
+    parser.add_argument("--port", type=int, default=8080, help="监听端口")
+    parser.add_argument("--bundle", help="从bundle.py生成的目录包读取目录，不再联网下载")
+    parser.add_argument("--index-db", help="索引保存在SQLite数据库中并直接查询 (多个服务进程共用)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.bundle:
+        catalog.BUNDLE_FILE = args.bundle
+    if args.index_db:
+        snapshot.INDEX_DB = args.index_db
+    batch.MEMO_SIZE = MEMO_SIZE
+
+    service = TranslationService()
+    loaded = service.load()
+    if not loaded:
+        print("✗ 所有翻译数据都加载失败，服务未启动")
+        return 1
+
+    httpd = ThreadingHTTPServer((args.host, args.port), TranslationHandler)
+    httpd.daemon_threads = True
+    httpd.service = service
+    print(f"✓ 翻译服务已启动: http://{args.host}:{httpd.server_address[1]} (可用分类: {', '.join(loaded)})")
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n服务已停止")
+    finally:
+        httpd.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
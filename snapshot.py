@@ -0,0 +1,140 @@
+import os
+import pickle
+import catalog
+from catalog import CACHE_DIR, LOCALE, catalog_digest, write_atomic
+
+# 索引快照格式版本，索引结构变化时递增以使旧快照失效
+SNAPSHOT_VERSION = 3
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "index")
+ENABLED = True  # 设为False时总是重新构建索引 (基准测试使用)
+# 索引数据库文件 (见sqlite_index.py)，设置后索引保存在SQLite中，翻译时直接查询数据库，
+# 多个进程共用同一份索引而不必各自加载到内存
+INDEX_DB = os.environ.get("INDEX_DB") or None
+
+def _snapshot_file(kind, digest):
+    """快照文件名包含目录内容哈希，目录更新后自动失效"""
+    return os.path.join(SNAPSHOT_DIR, f"{kind}-v{SNAPSHOT_VERSION}-{digest[:16]}.pickle")
+
+def _locale(translator):
+    """翻译器使用的目录语言"""
+    return getattr(translator, 'locale', LOCALE)
+
+def index_kind(translator):
+    """快照按翻译器区分 (通用翻译器的各分类通过snapshot_kind区分，非默认语言带上语言后缀)"""
+    kind = getattr(translator, 'snapshot_kind', None) or type(translator).__name__
+    locale = _locale(translator)
+    return kind if locale == LOCALE else f"{kind}-{locale}"
+
+def restore_index(translator, catalog_name, attrs):
+    """从快照恢复翻译器的索引属性，成功返回True"""
+    if not ENABLED:
+        return False
+    digest = catalog_digest(catalog_name, _locale(translator))
+    if not digest:
+        return False
+    
+    kind = index_kind(translator)
+    if catalog.BUNDLE_FILE and _restore_from_bundle(translator, kind, digest, attrs):
+        return True
+    if INDEX_DB:
+        return _restore_from_db(translator, kind, digest, attrs)
+    
+    snapshot_file = _snapshot_file(kind, digest)
+    try:
+        with open(snapshot_file, 'rb') as f:
+            snapshot = pickle.load(f)
+        state = snapshot['state'] if snapshot.get('digest') == digest else None
+        if state is None or set(state) != set(attrs):
+            return False
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        # 快照损坏或由不兼容的代码写出 (unpickle可能抛出任何异常)，重新构建索引
+        print(f"! 读取索引快照失败，重新构建索引: {str(e)}")
+        return False
+    
+    for attr, value in state.items():
+        setattr(translator, attr, value)
+    return True
+
+def save_index(translator, catalog_name, attrs):
+    """把构建好的索引属性保存为快照，并删除同一翻译器的旧快照"""
+    if not ENABLED:
+        return False
+    digest = catalog_digest(catalog_name, _locale(translator))
+    if not digest:
+        return False
+    
+    kind = index_kind(translator)
+    if INDEX_DB:
+        return _save_to_db(translator, kind, digest, attrs)
+    
+    snapshot_file = _snapshot_file(kind, digest)
+    snapshot = {
+        'digest': digest,
+        'state': {attr: getattr(translator, attr) for attr in attrs},
+    }
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        write_atomic(snapshot_file, pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+        
+        for old_file in os.listdir(SNAPSHOT_DIR):
+            old_path = os.path.join(SNAPSHOT_DIR, old_file)
+            # 按"类型-v"匹配，不会删除同一翻译器其他语言的快照
+            if old_file.startswith(f"{kind}-v") and old_file.endswith(".pickle") and old_path != snapshot_file:
+                os.remove(old_path)
+    except OSError as e:
+        print(f"! 保存索引快照失败: {str(e)}")
+        return False
+    return True
+
+def _restore_from_bundle(translator, kind, digest, attrs):
+    """把索引属性替换为目录包中查找表的只读视图 (见bundle.py)，目录包中没有对应的索引时返回False"""
+    from bundle import open_bundle
+    try:
+        state = open_bundle(catalog.BUNDLE_FILE).index(kind, digest, SNAPSHOT_VERSION, attrs)
+    except Exception as e:
+        print(f"! 读取目录包中的索引失败: {str(e)}")
+        return False
+    if state is None:
+        return False
+    
+    for attr, value in state.items():
+        setattr(translator, attr, value)
+    return True
+
+def _restore_from_db(translator, kind, digest, attrs):
+    """把索引属性替换为数据库中对应表的只读视图"""
+    import sqlite_index
+    try:
+        state = sqlite_index.load(INDEX_DB, kind, digest, SNAPSHOT_VERSION, attrs)
+    except Exception as e:
+        print(f"! 读取索引数据库失败，重新构建索引: {str(e)}")
+        return False
+    if state is None:
+        return False
+    
+    for attr, value in state.items():
+        setattr(translator, attr, value)
+    return True
+
+def index_missing(translator):
+    """翻译器的索引视图对应的数据库快照是否已被删除 (不使用索引数据库时总是False)"""
+    if not INDEX_DB:
+        return False
+    import sqlite_index
+    for value in vars(translator).values():
+        if isinstance(value, (sqlite_index.SqliteTable, sqlite_index.SqliteTables)):
+            return not sqlite_index.snapshot_exists(value.path, value.snapshot_id)
+    return False
+
+def _save_to_db(translator, kind, digest, attrs):
+    """把构建好的索引写入数据库 (同一翻译器的旧索引一并删除)"""
+    import sqlite3
+    import sqlite_index
+    try:
+        sqlite_index.save(INDEX_DB, kind, digest, SNAPSHOT_VERSION, {attr: getattr(translator, attr) for attr in attrs})
+    except sqlite3.Error as e:
+        print(f"! 保存索引数据库失败: {str(e)}")
+        return False
+    return True
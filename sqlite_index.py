@@ -0,0 +1,281 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+# 数据库结构版本 (保存在user_version中)，结构变化时递增，旧结构的数据库会被清空重建
+SCHEMA_VERSION = 2
+
+# snapshots.id使用AUTOINCREMENT，删除的快照ID不会被新快照复用；
+# last_used为最近一次被加载或查询的时间，只删除长时间没有使用的旧快照，
+# 视图发现自己的快照已被删除时抛出SnapshotMissingError，不会静默地查不到数据
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        digest TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        last_used REAL NOT NULL,
+        attrs BLOB NOT NULL,
+        UNIQUE (kind, digest, version)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        snapshot INTEGER NOT NULL,
+        attr TEXT NOT NULL,
+        sub TEXT NOT NULL,
+        key NOT NULL,
+        value,
+        PRIMARY KEY (snapshot, attr, sub, key)
+    ) WITHOUT ROWID
+    """,
+]
+
+# 每次executemany写入的行数
+INSERT_BATCH = 5000
+# 同一翻译器的旧快照超过该秒数没有使用才删除
+PRUNE_AGE = 7 * 24 * 3600
+# 视图每隔该秒数最多更新一次快照的last_used (查询时)
+TOUCH_INTERVAL = 3600
+
+_connections = threading.local()
+_touched = {}  # (数据库文件, 快照ID) 到本进程最近一次更新last_used时间的映射
+_MISSING = object()
+
+class SnapshotMissingError(RuntimeError):
+    """视图对应的快照已从数据库中删除，需要重新加载或建立索引"""
+
+    def __init__(self, path, snapshot_id):
+        super().__init__(f"索引数据库 {path} 中的快照 {snapshot_id} 已被删除，需要重新加载索引")
+        self.path = path
+        self.snapshot_id = snapshot_id
+
+def _connect(path):
+    """返回当前线程的数据库连接 (sqlite3连接不能跨线程和进程使用)"""
+    cache = getattr(_connections, 'cache', None)
+    if cache is None or _connections.pid != os.getpid():
+        cache = _connections.cache = {}
+        _connections.pid = os.getpid()
+    connection = cache.get(path)
+    if connection is None:
+        connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        _ensure_schema(connection)
+        cache[path] = connection
+    return connection
+
+def _ensure_schema(connection):
+    """创建数据表，旧结构的数据库 (只保存可以重建的索引) 先清空"""
+    if connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+        return
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        # 其他进程可能已经完成了升级
+        if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS entries")
+            connection.execute("DROP TABLE IF EXISTS snapshots")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+
+def snapshot_exists(path, snapshot_id):
+    """快照是否仍在数据库中"""
+    return _connect(path).execute("SELECT 1 FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone() is not None
+
+def _check(path, snapshot_id):
+    if not snapshot_exists(path, snapshot_id):
+        raise SnapshotMissingError(path, snapshot_id)
+
+def _touch(path, snapshot_id, force=False):
+    """更新快照的last_used (每TOUCH_INTERVAL秒最多一次)，快照已被删除时抛出SnapshotMissingError"""
+    now = time.time()
+    key = (path, snapshot_id)
+    if not force and now - _touched.get(key, 0) < TOUCH_INTERVAL:
+        return
+    cursor = _connect(path).execute("UPDATE snapshots SET last_used = ? WHERE id = ?", (now, snapshot_id))
+    if cursor.rowcount == 0:
+        raise SnapshotMissingError(path, snapshot_id)
+    _touched[key] = now
+
+class SqliteTable:
+    """数据库中一张索引表的只读视图，接口与dict的读取方法相同
+
+    数据不加载到内存，每次get都查询数据库，多个进程通过系统页缓存共享同一份索引。
+    查询时定期更新快照的last_used；查不到键时确认快照仍然存在，快照已被删除则抛出
+    SnapshotMissingError (而不是当作没有翻译)。
+    """
+
+    def __init__(self, path, snapshot_id, attr, sub=''):
+        self.path = path
+        self.snapshot_id = snapshot_id
+        self.attr = attr
+        self.sub = sub
+
+    def _query(self, sql, *params):
+        return _connect(self.path).execute(sql, (self.snapshot_id, self.attr, self.sub, *params))
+
+    def get(self, key, default=None):
+        _touch(self.path, self.snapshot_id)
+        try:
+            row = self._query(
+                "SELECT value FROM entries WHERE snapshot = ? AND attr = ? AND sub = ? AND key = ?", key).fetchone()
+        except sqlite3.InterfaceError:
+            # 键的类型无法存入SQLite (如元组)，与dict中找不到相同
+            return default
+        if row is None:
+            _check(self.path, self.snapshot_id)
+            return default
+        return row[0]
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        _check(self.path, self.snapshot_id)
+        return self._query("SELECT COUNT(*) FROM entries WHERE snapshot = ? AND attr = ? AND sub = ?").fetchone()[0]
+
+    def __iter__(self):
+        _check(self.path, self.snapshot_id)
+        for key, in self._query("SELECT key FROM entries WHERE snapshot = ? AND attr = ? AND sub = ?"):
+            yield key
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        _check(self.path, self.snapshot_id)
+        return iter(self._query("SELECT key, value FROM entries WHERE snapshot = ? AND attr = ? AND sub = ?"))
+
+class SqliteTables:
+    """嵌套索引 (如 index['weapon_paint']) 的视图，不存在的子索引返回空表 (与defaultdict(dict)相同)"""
+
+    def __init__(self, path, snapshot_id, attr, subs):
+        self.path = path
+        self.snapshot_id = snapshot_id
+        self.attr = attr
+        self.subs = subs
+
+    def __getitem__(self, sub):
+        return SqliteTable(self.path, self.snapshot_id, self.attr, sub)
+
+    def get(self, sub, default=None):
+        return self[sub] if sub in self.subs else default
+
+    def __contains__(self, sub):
+        return sub in self.subs
+
+    def __iter__(self):
+        return iter(self.subs)
+
+    def __len__(self):
+        return len(self.subs)
+
+    def items(self):
+        return [(sub, self[sub]) for sub in self.subs]
+
+def attr_layout(value):
+    """判断属性的存储方式: 'nested'为defaultdict(dict)或值都是dict的dict，'flat'为普通dict，其余为'scalar'"""
+    if isinstance(value, dict):
+        if getattr(value, 'default_factory', None) is dict or (value and all(isinstance(sub, dict) for sub in value.values())):
+            return 'nested'
+        return 'flat'
+    return 'scalar'
+
+def save(path, kind, digest, version, state):
+    """把翻译器的索引属性写入数据库，并删除同一翻译器超过PRUNE_AGE秒没有使用的旧索引
+
+    state为{属性名: 值}。dict属性逐项写入entries表，其余属性序列化后保存在snapshots表中。
+    已有相同的索引 (其他进程已经写入) 时不重复写入。
+    """
+    connection = _connect(path)
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        row = connection.execute(
+            "SELECT id FROM snapshots WHERE kind = ? AND digest = ? AND version = ?", (kind, digest, version)).fetchone()
+        if row is not None:
+            connection.execute("COMMIT")
+            return row[0]
+
+        # 删除同一翻译器旧版本目录的索引 (最近使用过的可能仍有进程在使用，保留)
+        now = time.time()
+        for old_id, in connection.execute(
+                "SELECT id FROM snapshots WHERE kind = ? AND last_used < ?", (kind, now - PRUNE_AGE)).fetchall():
+            connection.execute("DELETE FROM entries WHERE snapshot = ?", (old_id,))
+            connection.execute("DELETE FROM snapshots WHERE id = ?", (old_id,))
+
+        layout = {}
+        scalars = {}
+        for attr, value in state.items():
+            layout[attr] = attr_layout(value)
+            if layout[attr] == 'scalar':
+                scalars[attr] = value
+            elif layout[attr] == 'nested':
+                layout[attr] = ('nested', list(value))
+
+        cursor = connection.execute(
+            "INSERT INTO snapshots (kind, digest, version, last_used, attrs) VALUES (?, ?, ?, ?, ?)",
+            (kind, digest, version, now, pickle.dumps({'layout': layout, 'scalars': scalars}, protocol=pickle.HIGHEST_PROTOCOL)))
+        snapshot_id = cursor.lastrowid
+
+        batch = []
+        for attr, value in state.items():
+            if isinstance(layout[attr], tuple):
+                rows = ((snapshot_id, attr, sub, key, item) for sub, table in value.items() for key, item in table.items())
+            elif layout[attr] == 'flat':
+                rows = ((snapshot_id, attr, '', key, item) for key, item in value.items())
+            else:
+                continue
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= INSERT_BATCH:
+                    connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", batch)
+                    batch.clear()
+        if batch:
+            connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", batch)
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    return snapshot_id
+
+def load(path, kind, digest, version, attrs):
+    """返回{属性名: 视图或值}，数据库中没有对应的索引时返回None"""
+    connection = _connect(path)
+    row = connection.execute(
+        "SELECT id, attrs FROM snapshots WHERE kind = ? AND digest = ? AND version = ?", (kind, digest, version)).fetchone()
+    if row is None:
+        return None
+
+    snapshot_id, stored = row[0], pickle.loads(row[1])
+    layout = stored['layout']
+    if set(layout) != set(attrs):
+        return None
+    try:
+        _touch(path, snapshot_id, force=True)
+    except SnapshotMissingError:
+        # 读取之后被其他进程删除
+        return None
+
+    state = {}
+    for attr, storage in layout.items():
+        if isinstance(storage, tuple):
+            state[attr] = SqliteTables(path, snapshot_id, attr, frozenset(storage[1]))
+        elif storage == 'flat':
+            state[attr] = SqliteTable(path, snapshot_id, attr)
+        else:
+            state[attr] = stored['scalars'][attr]
+    return state
@@ -0,0 +1,105 @@
+import threading
+import time
+
+# 是否记录各匹配层级的命中次数和耗时 (默认关闭，关闭时几乎没有额外开销)
+ENABLED = False
+
+# (翻译器, 层级) 到 [命中次数, 未命中次数, 累计耗时秒数] 的映射，按首次出现的顺序保存
+_counters = {}
+_lock = threading.Lock()
+
+def enable(enabled=True):
+    """开启或关闭统计"""
+    global ENABLED
+    ENABLED = bool(enabled)
+
+def reset():
+    """清空已记录的统计"""
+    with _lock:
+        _counters.clear()
+
+def _add(translator, tier, hits, misses, seconds):
+    with _lock:
+        entry = _counters.get((translator, tier))
+        if entry is None:
+            entry = _counters[(translator, tier)] = [0, 0, 0.0]
+        entry[0] += hits
+        entry[1] += misses
+        entry[2] += seconds
+
+def record(translator, tier, hit, seconds=0.0):
+    """记录一次层级查找的结果"""
+    _add(translator, tier, 1 if hit else 0, 0 if hit else 1, seconds)
+
+class _Probe:
+    """记录一次translate_item调用经过的层级
+
+    每次hit/miss把距上一次记录(或开始)的时间计入该层级。
+    """
+    __slots__ = ('translator', 'last')
+
+    def __init__(self, translator):
+        self.translator = translator
+        self.last = time.perf_counter()
+
+    def hit(self, tier):
+        """该层级匹配成功"""
+        self._record(tier, True)
+
+    def miss(self, tier):
+        """该层级没有匹配，继续下一层级"""
+        self._record(tier, False)
+
+    def _record(self, tier, hit):
+        now = time.perf_counter()
+        record(self.translator, tier, hit, now - self.last)
+        self.last = now
+
+class _NullProbe:
+    """统计关闭时使用的空记录器"""
+    __slots__ = ()
+
+    def hit(self, tier):
+        pass
+
+    def miss(self, tier):
+        pass
+
+_NULL_PROBE = _NullProbe()
+
+def probe(translator):
+    """开始记录一次翻译，统计关闭时返回空记录器"""
+    return _Probe(translator) if ENABLED else _NULL_PROBE
+
+def count(translator, tier, hit=True):
+    """只计数不计时 (用于批量翻译的缓存命中等高频路径)"""
+    if ENABLED:
+        record(translator, tier, hit)
+
+def snapshot():
+    """导出当前统计，可序列化后传回主进程"""
+    with _lock:
+        return [(translator, tier, list(entry)) for (translator, tier), entry in _counters.items()]
+
+def merge(data):
+    """合并snapshot()导出的统计 (如子进程的结果)"""
+    for translator, tier, (hits, misses, seconds) in data:
+        _add(translator, tier, hits, misses, seconds)
+
+def summary_lines():
+    """生成按翻译器分组的统计报告"""
+    groups = {}
+    for translator, tier, entry in snapshot():
+        groups.setdefault(translator, []).append((tier, entry))
+
+    lines = []
+    for translator, tiers in groups.items():
+        lines.append(f"{translator}:")
+        for tier, (hits, misses, seconds) in tiers:
+            calls = hits + misses
+            rate = hits / calls * 100 if calls else 0.0
+            avg = seconds / calls * 1e6 if calls else 0.0
+            lines.append(f"  {tier:<20} 命中 {hits:>8}  未命中 {misses:>8}  命中率 {rate:>6.2f}%"
+                         f"  耗时 {seconds * 1000:>9.2f}ms  平均 {avg:>7.2f}µs")
+    return lines
+